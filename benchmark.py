@@ -0,0 +1,267 @@
+import sys
+import time
+import json
+import argparse
+from pathlib import Path
+
+# Add the parent directory to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from Emperor.test import TestExtraction, MAX_CAPTURES, NAME_ALLOWLIST
+from Emperor.utils.ocr_pool import OCRPool, READER_MODES, reader_options
+from Emperor.utils.rows import RowRecognizer
+from Emperor.utils.pipeline import StageTimer, percentile
+from Emperor.utils.capture import ReplayBackend, find_sessions
+from Emperor.utils.preprocess import PROFILES
+from Emperor.utils.names import NameCanonicalizer
+from Emperor.utils.engine import fixed_ranges
+from Emperor.utils.sweep import SweepScheduler, SimulatedPopulation, simulate
+from Emperor.utils.orchestrator import simulate_lanes
+
+
+def score_names(found, expected):
+    """Recall and precision of the extracted names against the ground truth"""
+    found, expected = set(found), set(expected)
+    hits = len(found & expected)
+    recall = hits / len(expected) if expected else 1.0
+    precision = hits / len(found) if found else 1.0
+    return recall, precision
+
+
+def run_session(tester, session_dir, timer):
+    """Replay one recorded session through get_total_players and the names pipeline"""
+    backend = ReplayBackend(session_dir)
+    tester.capture = backend
+    tester.canonicalizer = NameCanonicalizer()
+    if tester.row_reader:
+        tester.row_reader = RowRecognizer(tester.ocr, tester.allowlist)
+
+    with timer.measure('total_players'):
+        total_players = tester.get_total_players()
+    required_captures = tester.calculate_required_captures(total_players)
+
+    started = time.perf_counter()
+    pages = tester.extract_names(min(required_captures, MAX_CAPTURES),
+                                 expected=tester.confident_total(total_players))
+    elapsed = time.perf_counter() - started
+
+    for stage in ('capture', 'ocr'):
+        for sample in tester.last_pipeline.timer.samples(stage):
+            timer.add(stage, sample)
+    timer.add('session', elapsed)
+
+    names = set(tester.last_merger.names)
+    result = {
+        'session': session_dir,
+        'frames': len(pages),
+        'elapsed': elapsed,
+        'total_players': total_players,
+        'total_confidence': tester.total_confidence,
+        'names': sorted(names)
+    }
+    if backend.truth:
+        result['recall'], result['precision'] = score_names(names, backend.truth.get('names', []))
+        if 'total_players' in backend.truth:
+            result['total_players_correct'] = total_players == backend.truth['total_players']
+    return result
+
+
+def summarize(results, timer):
+    frames = sum(r['frames'] for r in results)
+    elapsed = sum(r['elapsed'] for r in results)
+    scored = [r for r in results if 'recall' in r]
+    counted = [r for r in results if 'total_players_correct' in r]
+
+    summary = {
+        'sessions': len(results),
+        'frames': frames,
+        'frames_per_sec': frames / elapsed if elapsed else 0.0,
+        'stages': {
+            stage: {q: percentile(timer.samples(stage), q) for q in (50, 90, 99)}
+            for stage in ('total_players', 'capture', 'ocr', 'session')
+        }
+    }
+    if scored:
+        summary['recall'] = sum(r['recall'] for r in scored) / len(scored)
+        summary['precision'] = sum(r['precision'] for r in scored) / len(scored)
+    if counted:
+        summary['total_players_accuracy'] = sum(r['total_players_correct'] for r in counted) / len(counted)
+    return summary
+
+
+def print_summary(summary):
+    print(f"Sessions: {summary['sessions']}  Frames: {summary['frames']}  "
+          f"Frames/sec: {summary['frames_per_sec']:.2f}")
+    print(f"{'stage':<15}{'p50':>10}{'p90':>10}{'p99':>10}")
+    for stage, values in summary['stages'].items():
+        print(f"{stage:<15}" + ''.join(f"{values[q] * 1000:>8.1f}ms" for q in (50, 90, 99)))
+    if 'recall' in summary:
+        print(f"Name recall: {summary['recall']:.1%}  precision: {summary['precision']:.1%}")
+    if 'total_players_accuracy' in summary:
+        print(f"Player count accuracy: {summary['total_players_accuracy']:.1%}")
+
+
+def print_comparison(report):
+    """One line per profile: OCR latency against name accuracy"""
+    print(f"\n{'profile':<20}{'ocr p50':>10}{'ocr p90':>10}{'recall':>9}{'precision':>11}")
+    for profile, entry in report.items():
+        summary = entry['summary']
+        ocr = summary['stages']['ocr']
+        recall = f"{summary['recall']:.1%}" if 'recall' in summary else '--'
+        precision = f"{summary['precision']:.1%}" if 'precision' in summary else '--'
+        print(f"{profile:<20}{ocr[50] * 1000:>8.1f}ms{ocr[90] * 1000:>8.1f}ms{recall:>9}{precision:>11}")
+
+
+def print_reader_comparison(report):
+    """One line per reader mode: load time, OCR latency, worker memory and name accuracy"""
+    print(f"\n{'mode':<8}{'load':>8}{'ocr p50':>10}{'ocr p90':>10}{'peak mem':>11}{'recall':>9}{'precision':>11}")
+    for mode, entry in report.items():
+        summary = entry['summary']
+        ocr = summary['stages']['ocr']
+        recall = f"{summary['recall']:.1%}" if 'recall' in summary else '--'
+        precision = f"{summary['precision']:.1%}" if 'precision' in summary else '--'
+        print(f"{mode:<8}{entry['startup']:>7.1f}s{ocr[50] * 1000:>8.1f}ms{ocr[90] * 1000:>8.1f}ms"
+              f"{entry['peak_memory'] / 2 ** 20:>8.0f} MB{recall:>9}{precision:>11}")
+
+
+def compare_readers(modes, sessions, args):
+    """Replay the sessions once per reader mode, each with a freshly loaded pool"""
+    report = {}
+    for mode in modes:
+        options = reader_options(mode, args.workers, NAME_ALLOWLIST, args.threads)
+        print(f"\n== reader: {mode} ({', '.join(options['languages'])}, "
+              f"{'int8' if options['quantize'] else 'fp32'}, threads {options['threads'] or 'default'}) ==")
+
+        ocr = OCRPool(workers=args.workers, **options)
+        try:
+            startup = ocr.start()
+            tester = TestExtraction(ocr_pool=ocr, row_mode=args.row_mode,
+                                    capture_backend=ReplayBackend(sessions[0]))
+            if not args.verbose:
+                tester.log = lambda message: None
+
+            timer = StageTimer()
+            results = [run_session(tester, session, timer) for session in sessions]
+            summary = summarize(results, timer)
+            print_summary(summary)
+            # Largest worker, since each one holds its own copy of the model
+            peak_memory = max(ocr.peak_memory().values())
+        finally:
+            ocr.shutdown()
+        report[mode] = {'options': options, 'startup': startup, 'peak_memory': peak_memory,
+                        'summary': summary, 'sessions': results}
+
+    print_reader_comparison(report)
+    return report
+
+
+def run_sweep(width, queries, seed):
+    """Compare fixed level ranges with the adaptive scheduler on a simulated population"""
+    population = SimulatedPopulation(seed=seed)
+    fixed = list(fixed_ranges(width))
+    baseline = simulate((fixed[i % len(fixed)] for i in range(queries)), population, queries)
+
+    population = SimulatedPopulation(seed=seed)
+    scheduler = SweepScheduler(width, clock=lambda: population.clock)
+    adaptive = simulate(scheduler, population, queries)
+
+    print(f"\n== Range sweep: {queries} queries, width {width} ==")
+    for label, result in (('fixed', baseline), ('adaptive', adaptive)):
+        print(f"{label:<9} {result['unique_names']:>5} names  {result['names_per_minute']:6.1f}/min  "
+              f"{result['capped_queries']:>3} capped")
+    print(f"Final ranges: {', '.join(f'{low}-{high}' for low, high in scheduler.bounds)}")
+    return {'fixed': baseline, 'adaptive': adaptive}
+
+
+def run_lanes(count, queries, width, seed, batch=False):
+    """Run 1 to `count` simulated clients on fake windows and compare their invite rates"""
+    handoff = 'scan, then invite' if batch else 'streamed'
+    print(f"\n== Multi-client: {queries} queries, width {width}, {handoff} ==")
+    print(f"{'lanes':<7}{'elapsed':>9}{'invites':>9}{'per min':>9}{'first':>8}{'dupes':>7}{'misdirected':>13}  per lane")
+    results = []
+    for lanes in range(1, count + 1):
+        result = simulate_lanes(lanes, queries=queries, width=width, seed=seed, stream=not batch)
+        first = f"{result['first_invite']:.2f}s" if result['first_invite'] is not None else '--'
+        print(f"{lanes:<7}{result['elapsed']:>8.1f}s{result['invites']:>9}{result['invites_per_minute']:>9.1f}"
+              f"{first:>8}{result['duplicate_invites']:>7}{result['misdirected_inputs']:>13}  "
+              f"{' '.join(str(sent) for sent in result['invites_per_lane'])}")
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded capture sessions and time the OCR pipeline")
+    parser.add_argument('sessions', nargs='*', help="Session directories, or folders containing them")
+    parser.add_argument('--workers', type=int, default=1, help="OCR worker processes")
+    parser.add_argument('--row-mode', action='store_true', help="Use row-segmented recognition")
+    parser.add_argument('--profiles', nargs='+', choices=sorted(PROFILES),
+                        help="Preprocessing profiles to compare on --region")
+    parser.add_argument('--region', default='names', help="Region the profiles are applied to")
+    parser.add_argument('--json', help="Also write the results to this file")
+    parser.add_argument('--verbose', action='store_true', help="Show the extraction log")
+    parser.add_argument('--readers', nargs='+', choices=READER_MODES,
+                        help="Compare OCR reader modes on the sessions instead of preprocessing profiles")
+    parser.add_argument('--threads', type=int, help="Torch threads per OCR worker in the cpu reader (default: cores / workers)")
+    parser.add_argument('--sweep', type=int, metavar='QUERIES',
+                        help="Simulate this many /who queries with the range scheduler instead")
+    parser.add_argument('--width', type=int, default=10, help="Starting level range width for --sweep")
+    parser.add_argument('--seed', type=int, default=1, help="Population seed for --sweep and --lanes")
+    parser.add_argument('--lanes', type=int, metavar='CLIENTS',
+                        help="Simulate up to this many game clients on fake windows instead")
+    parser.add_argument('--batch', action='store_true',
+                        help="With --lanes, invite each range only after its scan, as before streaming")
+    args = parser.parse_args()
+
+    if args.lanes:
+        run_lanes(args.lanes, args.sweep or 12, args.width, args.seed, batch=args.batch)
+        return 0
+
+    if args.sweep:
+        run_sweep(args.width, args.sweep, args.seed)
+        return 0
+
+    sessions = [session for path in args.sessions for session in find_sessions(path)]
+    if not sessions:
+        print("No recorded sessions found")
+        return 1
+
+    if args.readers:
+        report = compare_readers(args.readers, sessions, args)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=4)
+        return 0
+
+    ocr = OCRPool(workers=args.workers, **reader_options('cpu', args.workers, NAME_ALLOWLIST, args.threads))
+    print(f"OCR pool ready in {ocr.start():.2f}s")
+    try:
+        tester = TestExtraction(ocr_pool=ocr, row_mode=args.row_mode,
+                                capture_backend=ReplayBackend(sessions[0]))
+        if not args.verbose:
+            tester.log = lambda message: None
+
+        report = {}
+        for profile in args.profiles or [tester.profiles[args.region]]:
+            tester.profiles[args.region] = profile
+            print(f"\n== {args.region}: {profile} ==")
+
+            timer = StageTimer()
+            results = [run_session(tester, session, timer) for session in sessions]
+            summary = summarize(results, timer)
+            print_summary(summary)
+            report[profile] = {'summary': summary, 'sessions': results}
+
+        if len(report) > 1:
+            print_comparison(report)
+
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=4)
+    finally:
+        ocr.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
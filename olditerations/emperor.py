@@ -1,5 +1,7 @@
+import sys
 import time
 import json
+from pathlib import Path
 import pygetwindow as gw
 import pyautogui
 import random
@@ -7,6 +9,13 @@ from PIL import ImageGrab, Image
 import easyocr
 import numpy as np
 
+# Add the directory above the Emperor package to Python path
+project_root = str(Path(__file__).resolve().parents[2])
+sys.path.append(project_root)
+
+from Emperor.utils.settle import SettleDetector
+from Emperor.utils.handoff import NameLog
+
 # Step 1: Bring the specified window to the foreground
 window_title = "Star Wars™: The Old Republic™"
 window = None
@@ -67,6 +76,8 @@ def capture_text_from_region(region):
 
 # Path to save the JSON file
 json_file_path = r"C:\Users\Chris\PycharmProjects\emperor\.venv\data\extracted_text.json"
+# Each new name is also streamed here as it is read; sends.py --follow invites from it during the scan
+stream_path = r"C:\Users\Chris\PycharmProjects\emperor\.venv\data\extracted_names.ndjson"
 
 # Load existing names from the JSON file if it exists
 try:
@@ -75,21 +86,41 @@ try:
 except FileNotFoundError:
     existing_text_lines = set()
 
+name_log = NameLog(stream_path)
+streamed = set()
+
+
+def stream_names(text_lines):
+    """Hand names not seen yet this run to the inviter right away"""
+    for line in text_lines:
+        if line not in streamed:
+            streamed.add(line)
+            name_log.add(line)
+
+
 # Perform initial text extraction
 initial_text_lines = capture_text_from_region(region)
 print(f"Extracted text: {initial_text_lines}")  # Print extracted text for debugging
+stream_names(initial_text_lines)
 final_text_lines = existing_text_lines.union(set(initial_text_lines))
 
+# Wait for the list to stop redrawing instead of sleeping a fixed 0.5 seconds
+settle = SettleDetector(lambda: np.array(ImageGrab.grab(bbox=region)))
+
 # Scroll and extract text 4 more times
 for i in range(4):
-    time.sleep(0.5)  # Small delay before scrolling
+    before, _ = settle.wait()  # Make sure the list is still before scrolling
     pyautogui.scroll(-20 * 120)  # Scroll down 20 times (120 is a typical scroll amount)
-    time.sleep(0.5)  # Small delay after scrolling
+    settle.wait(reference=settle.signature(before))  # Wait until the new page has been drawn
     move_mouse_to_random_right_edge(region)  # Move mouse to the right edge again before next capture
     new_text_lines = capture_text_from_region(region)
     print(f"Extracted text: {new_text_lines}")  # Print extracted text for debugging
+    stream_names(new_text_lines)
     final_text_lines.update(new_text_lines)  # Add new text lines, avoiding duplicates
 
+# Tell a following inviter the scan is over
+name_log.done()
+
 # Convert the final set to a list and sort it alphabetically
 final_text_lines = sorted(list(final_text_lines))
 
@@ -1,10 +1,24 @@
+import sys
 import time
 import json
+from collections import deque
+from pathlib import Path
 import pygetwindow as gw
-import pyautogui
-import random
+import easyocr
 from datetime import datetime
 
+# Add the directory above the Emperor package to Python path
+project_root = str(Path(__file__).resolve().parents[2])
+sys.path.append(project_root)
+
+from Emperor.utils.ledger import InviteLedger
+from Emperor.utils.cooldown import CooldownIndex
+from Emperor.utils.dispatcher import InviteDispatcher
+from Emperor.utils.capture import ScreenBackend
+from Emperor.utils.regions import RegionRegistry, WindowLocator
+from Emperor.utils.verifier import InviteVerifier, RetryQueue, SUCCESS
+from Emperor.utils.handoff import follow_names
+
 # Step 1: Bring the specified window to the foreground
 window_title = "Star Wars™: The Old Republic™"
 window = None
@@ -23,62 +37,98 @@ time.sleep(1)  # Step 2: Delay for 1 second
 
 # Path to the JSON files
 extracted_text_path = r"C:\Users\Chris\PycharmProjects\emperor\.venv\data\extracted_text.json"
+stream_path = r"C:\Users\Chris\PycharmProjects\emperor\.venv\data\extracted_names.ndjson"
 dnd_path = r"C:\Users\Chris\PycharmProjects\emperor\.venv\data\dnd.json"
 
-# Load the JSON arrays
-with open(extracted_text_path, 'r', encoding='utf-8') as json_file:
-    names = json.load(json_file)
+# dnd.json plus an append-only journal, indexed by date and name
+ledger = InviteLedger(dnd_path)
 
-# Load or initialize the dnd.json
-try:
-    with open(dnd_path, 'r', encoding='utf-8') as dnd_file:
-        dnd = json.load(dnd_file)
-except FileNotFoundError:
-    dnd = {}
+# Skip anyone invited in the last week, not just today
+cooldown_days = 7
+cooldown = CooldownIndex.from_ledger(ledger, days=cooldown_days)
+
+# --follow: invite names while emperor.py is still scanning, as it streams them
+follow = '--follow' in sys.argv
+if follow:
+    names = (name for name in follow_names(stream_path) if cooldown.is_eligible(name))
+else:
+    # Load the JSON arrays
+    with open(extracted_text_path, 'r', encoding='utf-8') as json_file:
+        names = deque(json.load(json_file))
+    eligible = cooldown.filter_eligible(names)
+    print(f"{len(names) - len(eligible)} of {len(names)} names invited in the last {cooldown_days} days, skipping them.")
+    names = deque(eligible)
 
 # Get today's date as a string
 today_str = datetime.now().strftime('%Y-%m-%d')
 
-# Ensure today's date is in the dnd dictionary
-if today_str not in dnd:
-    dnd[today_str] = []
-
-# Function to invite a player
-def invite_player(name):
-    pyautogui.press('enter')
-    time.sleep(random.uniform(0.2, 0.5))  # Random delay between 0.2 to 0.5 seconds
-    command = "/ginvite "
-    for char in command:
-        pyautogui.typewrite(char)
-        time.sleep(0.1)  # Small delay between each character to ensure they are typed correctly
-    pyautogui.typewrite(name)
-    pyautogui.press('enter')
-    time.sleep(0.5)  # Pause for 0.5 seconds before ending the script
-
-# Iterate over the names and invite each one
-while names:
-    name = names[0]
-    if name not in dnd[today_str]:
-        try:
-            print(f"Inviting {name}...")
-            invite_player(name)
-            dnd[today_str].append(name)  # Add the name to dnd under today's date
-            names.pop(0)  # Remove the name from the extracted text list
-            # Save the updated extracted text list
-            with open(extracted_text_path, 'w', encoding='utf-8') as json_file:
-                json.dump(names, json_file, ensure_ascii=False, indent=4)
-            # Save the updated dnd list
-            with open(dnd_path, 'w', encoding='utf-8') as dnd_file:
-                json.dump(dnd, dnd_file, ensure_ascii=False, indent=4)
-            print(f"Invited {name} to the guild.")
-        except Exception as e:
-            print(f"Error inviting {name}: {str(e)}")
+def on_sent(name):
+    ledger.record(name, today_str)  # One journal line instead of rewriting dnd.json
+    cooldown.record(name)
+    verifier.submit(name)
+    print(f"Invited {name} to the guild.")
+
+
+def on_verified(name, outcome, retried):
+    if outcome == SUCCESS:
+        return
+    if retried:
+        print(f"Invite to {name} failed ({outcome}), retrying later.")
+    else:
+        print(f"Invite to {name} failed ({outcome}).")
+        failed.append(name)
+
+
+def on_error(name, error):
+    print(f"Error inviting {name}: {str(error)}")
+    failed.append(name)
+
+
+# Invites go out from the dispatcher's own thread: one paste or typed command per
+# name, spaced by a token bucket (40/min on average, never above 60/min) with jitter.
+# At most 40 names wait in its queue; beyond that, reading more names waits too.
+# A crash mid-run is safe: extracted_text.json is only rewritten at the end,
+# and the ledger skips everyone already invited today when we start again.
+failed = []
+dispatcher = InviteDispatcher(rate_per_minute=40, ceiling_per_minute=60, on_sent=on_sent, on_error=on_error,
+                              max_pending=40)
+
+# The game's reply to each invite is read from the invites region on a separate
+# thread, so checking never slows the dispatcher down
+reader = easyocr.Reader(['en'], gpu=False)
+screen = ScreenBackend(RegionRegistry.from_file(), locator=WindowLocator(window_title))
+retries = RetryQueue(max_attempts=3, base_delay=30)
+verifier = InviteVerifier(lambda: screen.grab('invites'), reader, retry_queue=retries, on_result=on_verified)
+verifier.start()
+dispatcher.start()
+
+for name in names:
+    if not ledger.contains(name, today_str):
+        print(f"Queueing {name}...")
+        dispatcher.submit(name)
     else:
         print(f"{name} is already in the DND list for today.")
-        names.pop(0)  # Remove the name from the extracted text list since it's already in the DND list
-        # Save the updated extracted text list
-        with open(extracted_text_path, 'w', encoding='utf-8') as json_file:
-            json.dump(names, json_file, ensure_ascii=False, indent=4)
-    time.sleep(random.uniform(0.2, 0.75))  # Random delay between 0.2 to 0.75 seconds before the next invite
+
+dispatcher.join()
+verifier.join()
+
+# Players who were not found get another go after 30s, 60s, then 120s
+while len(retries):
+    for name in retries.due():
+        print(f"Retrying {name}...")
+        dispatcher.submit(name)
+    time.sleep(1)
+    dispatcher.join()
+    verifier.join()
+
+dispatcher.stop()
+verifier.stop()
+print(f"Verified invites: {verifier.counts} ({verifier.ocr_reads} OCR reads).")
+print(f"Sent {dispatcher.sent} invites at {dispatcher.throughput():.1f} invites/minute.")
+
+# Fold the journal back into dnd.json and keep only the failures for the next run
+ledger.close()
+with open(extracted_text_path, 'w', encoding='utf-8') as json_file:
+    json.dump(failed, json_file, ensure_ascii=False, indent=4)
 
 print("Processed all invitations and updated dnd list.")
@@ -1,46 +1,97 @@
+import sys
 import time
 import json
 from datetime import datetime, UTC
-import pygetwindow as gw
-import pyautogui
-import easyocr
-import numpy as np
-from PIL import ImageGrab, Image
-import unicodedata
+from pathlib import Path
+
+# Add the parent directory to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from Emperor.utils.ocr_pool import OCRPool, reader_options
+from Emperor.utils.pipeline import CapturePipeline
+from Emperor.utils.settle import SettleDetector
+from Emperor.utils.rows import RowRecognizer
+from Emperor.utils.recorder import FrameRecorder
+from Emperor.utils.capture import ScreenBackend
+from Emperor.utils.preprocess import REGION_PROFILES, get_profile
+from Emperor.utils.regions import RegionRegistry, WindowLocator
+from Emperor.utils.names import NameCanonicalizer, ScrollMerger, sort_names
+from Emperor.utils.scrollbar import thumb_at_bottom
+from Emperor.utils.digits import DigitReader
+
+# The /who list caps at 100 results, 20 per page, plus one for a partial scroll
+MAX_CAPTURES = 6
+
+# Characters that can appear in a character name
+NAME_ALLOWLIST = (
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZ '
+    'ÀÁÂÄÃÆÅ'
+    'ÈÉÊË'
+    'ÌÍÎÏ'
+    'ÒÓÔÖÕØ'
+    'ÙÚÛÜ'
+    'Ý'
+    'Ñ'
+    'Ç'
+    'ß'
+    '\'-'
+)
 
 
 class TestExtraction:
-    def __init__(self):
+    def __init__(self, ocr_pool=None, workers=1, cpu_only=True, row_mode=False, recorder=None,
+                 capture_backend=None, reader_mode='cpu', registry=None, window_locator=None):
         self.window_title = "Star Wars™: The Old Republic™"
 
-        # Initialize EasyOCR
-        print("Initializing EasyOCR...")
-        self.reader = easyocr.Reader(
-            ['en', 'fr', 'es', 'de', 'pt'],
-            gpu=True
-        )
+        # Share a warm OCR pool when one is handed in, otherwise start our own
+        self.ocr = ocr_pool or OCRPool(workers=workers, cpu_only=cpu_only,
+                                       **reader_options(reader_mode, workers, NAME_ALLOWLIST))
+        if not self.ocr.is_ready:
+            print("Initializing EasyOCR...")
+            startup_time = self.ocr.start()
+            print(f"EasyOCR ready in {startup_time:.2f}s")
 
-        self.regions = {
-            'who': (23, 51, 255, 105),
-            'text_entry': (62, 126, 436, 164),
-            'results': (776, 122, 1222, 172),
-            'scroll': (1187, 239, 1216, 1023),
-            'names': (58, 240, 400, 1016)
-        }
+        # Regions come from jsons/s and follow the game window when it moves; a
+        # multi-client lane hands in its own, pinned to its window
+        self.registry = registry or RegionRegistry.from_file()
+        self.window_locator = window_locator or WindowLocator(self.window_title)
 
-        self.allowlist = (
-            'ABCDEFGHIJKLMNOPQRSTUVWXYZ '
-            'ÀÁÂÄÃÆÅ'
-            'ÈÉÊË'
-            'ÌÍÎÏ'
-            'ÒÓÔÖÕØ'
-            'ÙÚÛÜ'
-            'Ý'
-            'Ñ'
-            'Ç'
-            'ß'
-            '\'-'
-        )
+        # Preprocessing profile per region, see utils/preprocess.py
+        self.profiles = dict(REGION_PROFILES)
+
+        # Screen capture by default; a ReplayBackend serves recorded sessions instead
+        self.capture = capture_backend or ScreenBackend(self.registry, locator=self.window_locator)
+
+        # Folds OCR variants of a name ("TOßÁ"/"TOBA") into one spelling
+        self.canonicalizer = NameCanonicalizer()
+
+        # Optional FrameRecorder for replaying the session later
+        self.recorder = recorder
+        self.last_pipeline = None
+        self.last_merger = None
+
+        # Set by the recruitment engine; called before every page so pause/stop land between pages
+        self.checkpoint = None
+        # Pages already read by an earlier session, scrolled past without OCR
+        self.page_offset = 0
+
+        # Settle polls grab the scrollbar from the same frame as the names
+        self.last_scroll = None
+        self.settle = SettleDetector(self.grab_list)
+
+        self.allowlist = NAME_ALLOWLIST
+
+        # Reads "Showing N results" from glyph templates learned off earlier OCR reads
+        self.digit_reader = DigitReader.load()
+        self.total_confidence = 0.0
+
+        # Row mode recognizes list rows directly and skips EasyOCR's detector
+        self.row_reader = RowRecognizer(self.ocr, self.allowlist) if row_mode else None
+
+    @property
+    def regions(self):
+        return self.registry.regions
 
     def log(self, message):
         """Log message with timestamp"""
@@ -49,20 +100,34 @@ class TestExtraction:
 
     def sort_names(self, names):
         """Sort names while properly handling accented characters"""
-        return sorted(names, key=lambda x: unicodedata.normalize('NFKD', x).encode('ASCII', 'ignore').decode())
+        return sort_names(names)
 
     def get_game_window(self):
         """Verify game window is available"""
-        for window in gw.getWindowsWithTitle(self.window_title):
-            if self.window_title in window.title:
-                return window
-        return None
+        return self.window_locator.get()
 
     def get_total_players(self):
-        """Get total number of players from results region"""
+        """Get total number of players from results region, or None if it cannot be read"""
+        try:
+            frame = self.grab_region('results')
+        except Exception as e:
+            self.log(f"Error getting player count: {str(e)}")
+            self.total_confidence = 0.0
+            return None
+        if self.recorder:
+            self.recorder.record('results', frame)
+
+        # Glyph templates first; a full OCR pass only when they are unsure
+        total_players, confidence = self.digit_reader.read(frame)
+        if total_players is not None and confidence >= self.digit_reader.min_confidence:
+            if 1 <= total_players <= 100:
+                self.total_confidence = confidence
+                self.log(f"Total players found: {total_players} (glyphs, confidence {confidence:.2f})")
+                return total_players
+
         try:
-            image = self.capture_region('results')
-            results = self.reader.readtext(
+            image = get_profile(self.profiles.get('results', 'legacy'))(frame)
+            results = self.ocr.readtext(
                 image,
                 detail=0,
                 paragraph=False,
@@ -80,42 +145,209 @@ class TestExtraction:
                     total_players = int(numbers)
                     # Validate the number is within acceptable range (1-100)
                     if 1 <= total_players <= 100:
+                        self.total_confidence = 1.0
                         self.log(f"Total players found: {total_players}")
+                        # Teach the glyph reader from this frame for next time
+                        if self.digit_reader.learn(frame, ' '.join(results)):
+                            self.digit_reader.save()
                         return total_players
                     else:
-                        self.log(f"WARNING: Invalid player count ({total_players}), defaulting to 20")
-                        return 20
+                        self.log(f"WARNING: Invalid player count ({total_players})")
+                        break
 
             self.log("WARNING: Could not determine player count")
-            return 20  # Default to one page if we can't determine
         except Exception as e:
             self.log(f"Error getting player count: {str(e)}")
-            return 20  # Default to one page on error
+        self.total_confidence = 0.0
+        return None
+
+    def confident_total(self, total_players):
+        """The player count if it was read confidently enough to stop paging on, else None"""
+        return total_players if self.total_confidence else None
 
     def calculate_required_captures(self, total_players):
         """Calculate how many captures needed based on total players"""
+        if total_players is None:
+            self.log(f"Player count unknown, allowing up to {MAX_CAPTURES} captures")
+            return MAX_CAPTURES
         # Each page shows 20 players
         required_captures = (total_players + 19) // 20  # Round up division
         self.log(f"Required captures: {required_captures} for {total_players} players")
         return required_captures
 
-    def capture_region(self, region_name):
+    def grab_region(self, region_name):
+        """Raw screenshot of a region as a numpy array, without any preprocessing"""
+        return self.capture.grab(region_name)
+
+    def grab_list(self):
+        """Names region for the settle detector, keeping the scrollbar from the same grab"""
+        frames = self.capture.grab_regions('names', 'scroll')
+        self.last_scroll = frames.get('scroll')
+        return frames['names']
+
+    def capture_region(self, region_name, frame=None):
         """Capture and preprocess a screenshot of the specified region"""
         region = self.regions[region_name]
         self.log(f"Capturing region {region_name}: {region}")
 
-        screenshot = ImageGrab.grab(bbox=region)
-        # Save original screenshot for verification
-        screenshot.save(f"test_capture_{region_name}_original.png")
+        # Reuse a frame that was already grabbed, e.g. by the settle detector
+        if frame is None:
+            frame = self.grab_region(region_name)
 
-        # Resize and save processed version
-        processed = screenshot.resize(
-            (screenshot.width * 2, screenshot.height * 2),
-            Image.LANCZOS
-        )
-        processed.save(f"test_capture_{region_name}_processed.png")
+        # Hand the original to the background recorder; never write to disk here
+        if self.recorder:
+            self.recorder.record(region_name, frame)
 
-        return np.array(processed)
+        return get_profile(self.profiles.get(region_name, 'legacy'))(frame)
+
+    def activate_window(self):
+        """Bring the game window to the front before the first input of a range"""
+        activate = getattr(self.capture, 'activate', None)
+        if activate is not None:
+            # A lane's backend does it under the input lock it shares with the other lanes
+            activate()
+            return
+        window = self.get_game_window()
+        if window is not None and not window.isActive:
+            window.activate()
+            time.sleep(0.5)
+
+    def before_input(self):
+        """Let the engine block or stop us before the mouse or keyboard is touched, e.g. on focus loss"""
+        if self.checkpoint:
+            self.checkpoint()
+
+    def scroll_page(self):
+        """Scroll the /who list down one page and return the settled frame"""
+        # Move to scroll area and let any hover redraw finish
+        x = self.regions['scroll'][0] + 5
+        y = self.regions['scroll'][1] + ((self.regions['scroll'][3] - self.regions['scroll'][1]) // 2)
+        self.before_input()
+        self.capture.move_to(x, y)
+        before, _ = self.settle.wait()
+        # Take the signature now; grabbed frames are reused by the next capture
+        reference = self.settle.signature(before)
+
+        # Scroll and capture as soon as the list stops changing
+        self.before_input()
+        self.capture.scroll(-20 * 120)
+        return self.settle.wait(reference=reference)
+
+    def grab_names_page(self, index):
+        """Scroll to page `index` of the /who list and capture the names region"""
+        self.before_input()
+
+        if index == 0 and self.page_offset:
+            self.log(f"Skipping {self.page_offset} page(s) read before the restart...")
+            for _ in range(self.page_offset - 1):
+                self.scroll_page()
+            frame, settled = self.scroll_page()
+        elif index > 0:
+            self.log(f"Performing scroll capture {index + self.page_offset}...")
+            frame, settled = self.scroll_page()
+        else:
+            self.log("Performing initial capture...")
+            frame, settled = self.settle.wait()
+
+        if not settled:
+            self.log(f"WARNING: names list still changing after {self.settle.last_wait:.2f}s")
+
+        # Thumb at the bottom of the track: this is the last page worth grabbing
+        if self.last_scroll is not None:
+            if self.recorder:
+                self.recorder.record('scroll', self.last_scroll)
+            if thumb_at_bottom(self.last_scroll):
+                self.log("Scrollbar at the bottom, no more pages")
+                self.last_pipeline.stop()
+
+        return self.capture_region('names', frame)
+
+    def read_names(self, image):
+        """Run a names capture through the OCR pool and return the cleaned lines"""
+        if self.row_reader:
+            return self.row_reader.read(image)
+
+        results = self.ocr.readtext(
+            image,
+            detail=0,
+            paragraph=False,
+            allowlist=self.allowlist,
+            contrast_ths=0.1,
+            text_threshold=0.7
+        )
+        return [name.strip() for name in results if name.strip()]
+
+    def extract_names(self, max_captures=MAX_CAPTURES, expected=None, done_pages=(), page_read=None,
+                      names_found=None):
+        """Capture and OCR pages of the /who list until it runs out, in page order
+
+        `done_pages` were read before a restart and are merged without OCR;
+        `page_read(names)` is called as each new page is merged, and
+        `names_found(names)` with the names that page added, so they can be
+        invited before the scan is over.
+        """
+        merger = ScrollMerger(self.canonicalizer, expected)
+        self.last_merger = merger
+        done_pages = [list(page) for page in done_pages]
+        for page in done_pages:
+            added = merger.add_page(page)
+            if names_found and added:
+                names_found(added)
+        if merger.done or len(done_pages) >= max_captures:
+            return done_pages
+
+        def on_page(index, names):
+            added = merger.add_page(names)
+            self.log(f"Page {index + len(done_pages)}: {len(added)} new names")
+            if page_read:
+                page_read(names)
+            if names_found and added:
+                names_found(added)
+            # Nothing new, or everyone counted: stop scrolling
+            if merger.done:
+                pipeline.stop()
+
+        # Scroll and grab on one thread while the OCR pool reads earlier pages
+        pipeline = CapturePipeline(self.grab_names_page, self.read_names,
+                                   ocr_workers=self.ocr.workers, on_page=on_page)
+        self.last_pipeline = pipeline
+        self.page_offset = len(done_pages)
+        try:
+            pages = done_pages + pipeline.run(max_captures - len(done_pages))
+        finally:
+            self.page_offset = 0
+
+        report = pipeline.report()
+        for stage, timing in report['stages'].items():
+            self.log(f"Stage {stage}: {timing['count']}x, mean {timing['mean']:.3f}s, max {timing['max']:.3f}s")
+        self.log(f"Pipeline finished in {report['elapsed']:.2f}s (bottleneck: {report['bottleneck']})")
+        if self.row_reader:
+            self.log(f"Rows recognized: {self.row_reader.recognized}, reused from cache: {self.row_reader.reused}")
+        return pages
+
+    def search(self, query):
+        """Type a query into the /who search box and wait for the list to redraw"""
+        box = self.regions['text_entry']
+        reference = self.settle.signature(self.grab_list())
+        self.before_input()
+        self.capture.click((box[0] + box[2]) // 2, (box[1] + box[3]) // 2)
+        self.capture.type_text(query)
+        self.settle.wait(reference=reference)
+
+    def scan(self, level_range, checkpoint=None, pages=None, on_page=None, on_names=None):
+        """Search one level range and return its merged names, for the recruitment engine
+
+        `pages` are pages of this range already read before a restart;
+        `on_names` gets each page's new names as soon as they are merged.
+        """
+        self.checkpoint = checkpoint
+        self.activate_window()
+        self.search(f"{level_range[0]}-{level_range[1]}")
+        total_players = self.get_total_players()
+        self.extract_names(min(self.calculate_required_captures(total_players), MAX_CAPTURES),
+                           expected=self.confident_total(total_players),
+                           done_pages=pages or (), page_read=on_page, names_found=on_names)
+        return list(self.last_merger.names)
 
     def test_extraction(self):
         """Test the name extraction process"""
@@ -135,85 +367,56 @@ class TestExtraction:
         total_players = self.get_total_players()
         required_captures = self.calculate_required_captures(total_players)
 
+        # The estimate caps paging; the list content or a trusted count can stop it sooner
+        pages = self.extract_names(min(required_captures, MAX_CAPTURES),
+                                   expected=self.confident_total(total_players))
+
         # Store all captured names
         all_captures = []
-        names_set = set()
-
-        # Initial capture
-        self.log("Performing initial capture...")
-        image = self.capture_region('names')
-        results = self.reader.readtext(
-            image,
-            detail=0,
-            paragraph=False,
-            allowlist=self.allowlist,
-            contrast_ths=0.1,
-            text_threshold=0.7
-        )
-
-        initial_names = [name.strip() for name in results if name.strip()]
-        all_captures.append({
-            "capture": "initial",
-            "names": initial_names
-        })
-        names_set.update(initial_names)
-
-        self.log(f"Initial names found: {initial_names}")
-
-        # Only perform additional captures if needed
-        for i in range(required_captures - 1):  # -1 because we already did initial capture
-            self.log(f"Performing scroll capture {i + 1}/{required_captures - 1}...")
-
-            # Move to scroll area
-            x = self.regions['scroll'][0] + 5
-            y = self.regions['scroll'][1] + ((self.regions['scroll'][3] - self.regions['scroll'][1]) // 2)
-            pyautogui.moveTo(x, y)
-            time.sleep(0.5)
-
-            # Scroll
-            pyautogui.scroll(-20 * 120)
-            time.sleep(0.5)
-
-            # Capture and process
-            image = self.capture_region('names')
-            results = self.reader.readtext(
-                image,
-                detail=0,
-                paragraph=False,
-                allowlist=self.allowlist,
-                contrast_ths=0.1,
-                text_threshold=0.7
-            )
 
-            new_names = [name.strip() for name in results if name.strip()]
+        for i, names in enumerate(pages):
+            label = "initial" if i == 0 else f"scroll_{i}"
             all_captures.append({
-                "capture": f"scroll_{i + 1}",
-                "names": new_names
+                "capture": label,
+                "names": names
             })
-            names_set.update(new_names)
+            self.log(f"Names found in {label}: {names}")
 
-            self.log(f"Names found in scroll {i + 1}: {new_names}")
+        # Pages were lined up row by row as they arrived, not set-unioned
+        unique_names = self.last_merger.names
 
         # Save results to JSON
         test_results = {
             "test_info": {
                 "date": datetime.now(UTC).strftime('%Y-%m-%d'),
                 "total_players_reported": total_players,
-                "captures_required": required_captures
+                "captures_required": required_captures,
+                "captures_taken": len(pages)
             },
-            "total_unique_names": len(names_set),
+            "total_unique_names": len(unique_names),
             "all_captures": all_captures,
-            "unique_names_sorted": self.sort_names(list(names_set))
+            "unique_names_sorted": self.sort_names(unique_names)
         }
 
         with open('test_results.json', 'w', encoding='utf-8') as f:
             json.dump(test_results, f, ensure_ascii=False, indent=4)
 
-        self.log(f"Test complete! Found {len(names_set)} unique names.")
+        self.log(f"Test complete! Found {len(unique_names)} unique names.")
         self.log("Results saved to test_results.json")
-        self.log("Screenshots saved as test_capture_*.png")
+        if self.recorder:
+            self.recorder.stop()
+            self.log(f"Frames recorded to {self.recorder.directory}: "
+                     f"{self.recorder.recorded} saved, {self.recorder.dropped} dropped")
 
 
 if __name__ == "__main__":
-    tester = TestExtraction()
-    tester.test_extraction()
\ No newline at end of file
+    # Pass --record <dir> to keep the captured frames for offline replay
+    recorder = None
+    if '--record' in sys.argv:
+        recorder = FrameRecorder(sys.argv[sys.argv.index('--record') + 1]).start()
+
+    tester = TestExtraction(recorder=recorder)
+    try:
+        tester.test_extraction()
+    finally:
+        tester.ocr.shutdown()
\ No newline at end of file
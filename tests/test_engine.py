@@ -0,0 +1,100 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the grandparent directory to Python path, like the scripts at the package root
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from Emperor.utils.dispatcher import InviteDispatcher
+from Emperor.utils.engine import RecruitmentEngine
+from Emperor.utils.focus import FakeBackend, FocusMonitor
+from Emperor.utils.verifier import RetryQueue
+
+
+class Sender:
+    def __init__(self):
+        self.commands = []
+
+    def send(self, command):
+        self.commands.append(command)
+
+
+def fake_scan(level_range, checkpoint, on_names=None):
+    checkpoint()
+    names = [f"PLAYER{level_range[0]}X{index}" for index in range(3)]
+    if on_names:
+        on_names(names)
+    return names
+
+
+def run_engine(backend, activate=None, during=None, timeout=5.0):
+    """Run the engine over two ranges with a focus monitor on `backend`; returns (engine, sender)"""
+    focus = FocusMonitor(backend).start()
+    sender = Sender()
+    dispatcher = InviteDispatcher(sender=sender, rate_per_minute=6000, ceiling_per_minute=6000, jitter=0,
+                                  can_send=lambda: focus.is_focused)
+    engine = RecruitmentEngine(fake_scan, dispatcher, [(1, 10), (11, 20)], poll_interval=0.01,
+                               focus=focus, activate=activate,
+                               on_batch=lambda logs, stats: None)
+    dispatcher.on_sent = lambda name: engine.invited(name)
+    engine.start()
+    if during:
+        during(engine)
+    engine._thread.join(timeout)
+    return engine, sender
+
+
+def test_start_from_the_gui_brings_the_game_forward_and_runs():
+    # Start is clicked in the GUI, so the game is not in front when the engine starts
+    backend = FakeBackend(focused=False)
+    engine, sender = run_engine(backend, activate=lambda: backend.set_focused(True))
+    assert not engine.is_running
+    assert len(sender.commands) == 6
+    assert engine.dispatcher.failed == 0
+
+
+def test_focus_loss_pauses_and_returning_focus_resumes():
+    backend = FakeBackend(focused=True)
+
+    def lose_focus_for_a_moment(engine):
+        backend.set_focused(False)
+        threading.Timer(0.3, backend.set_focused, (True,)).start()
+
+    engine, sender = run_engine(backend, during=lose_focus_for_a_moment)
+    assert not engine.is_running
+    assert len(sender.commands) == 6
+
+
+def test_dispatcher_holds_names_until_focus_returns():
+    focused = threading.Event()
+    sender = Sender()
+    dispatcher = InviteDispatcher(sender=sender, rate_per_minute=6000, ceiling_per_minute=6000, jitter=0,
+                                  can_send=focused.is_set).start()
+    dispatcher.submit('ALDRIC')
+    time.sleep(0.3)
+    assert sender.commands == [] and dispatcher.failed == 0
+    focused.set()
+    dispatcher.join()
+    dispatcher.stop()
+    assert sender.commands == ['/ginvite ALDRIC']
+
+
+def test_retries_scheduled_after_the_last_range_are_still_sent():
+    sender = Sender()
+    retries = RetryQueue(max_attempts=1, base_delay=0.2)
+    dispatcher = InviteDispatcher(sender=sender, rate_per_minute=6000, ceiling_per_minute=6000, jitter=0)
+    engine = RecruitmentEngine(fake_scan, dispatcher, [(1, 10)], retry_queue=retries, poll_interval=0.01,
+                               on_batch=lambda logs, stats: None)
+
+    def on_sent(name):
+        engine.invited(name)
+        # The last name of the last range is not found the first time
+        if name == 'PLAYER1X2' and not retries.attempts:
+            retries.add(name)
+    dispatcher.on_sent = on_sent
+    engine.start()
+    engine._thread.join(5.0)
+    assert not engine.is_running
+    assert sender.commands.count('/ginvite PLAYER1X2') == 2
+    assert len(retries) == 0
@@ -0,0 +1,28 @@
+import sys
+from pathlib import Path
+
+# Add the grandparent directory to Python path, like the scripts at the package root
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from Emperor.utils.cooldown import CooldownIndex
+from Emperor.utils.ledger import InviteLedger
+from Emperor.utils.orchestrator import SharedInvites
+
+
+def test_ocr_variants_share_one_cooldown(tmp_path):
+    path = str(tmp_path / 'dnd.json')
+    ledger = InviteLedger(path, sync=False)
+    assert ledger.record('TOßÁ')
+    assert not ledger.record('TOBA')
+    ledger.close()
+
+    # A later session reads the same player differently
+    cooldown = CooldownIndex.from_ledger(InviteLedger(path), days=7)
+    assert not cooldown.is_eligible('TOBA')
+    assert cooldown.filter_eligible(['tobá', 'TOBY']) == ['TOBY']
+
+
+def test_lanes_cannot_both_claim_an_ocr_variant():
+    invites = SharedInvites(CooldownIndex())
+    assert invites.claim(['TOßÁ'], 0) == ['TOßÁ']
+    assert invites.claim(['TOBA'], 1) == []
@@ -0,0 +1,50 @@
+import sys
+from pathlib import Path
+
+# Add the grandparent directory to Python path, like the scripts at the package root
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from Emperor.utils.names import NameCanonicalizer, ScrollMerger, match_key, merge_pages
+
+
+# A guild page where everyone is one letter away from someone else
+NEAR_IDENTICAL = ['KNIGHTA', 'KNIGHTB', 'KNIGHTC', 'KNIGHTD', 'KNIGHTE']
+
+
+def test_match_key_maps_confusables_before_uppercasing():
+    assert match_key('TOßÁ') == 'TOBA'
+    assert match_key('tobá') == 'TOBA'
+
+
+def test_near_identical_names_on_one_page_are_kept_apart():
+    canonicalizer = NameCanonicalizer()
+    assert canonicalizer.dedupe(NEAR_IDENTICAL) == NEAR_IDENTICAL
+    assert merge_pages([NEAR_IDENTICAL]) == NEAR_IDENTICAL
+
+
+def test_near_identical_names_are_not_merged_against_earlier_pages():
+    merger = ScrollMerger()
+    merger.add_page(NEAR_IDENTICAL[:3])
+    assert merger.add_page(['KNIGHTF', 'KNIGHTG']) == ['KNIGHTF', 'KNIGHTG']
+    assert not merger.exhausted
+
+
+def test_misread_row_in_the_page_overlap_is_one_player():
+    merger = ScrollMerger()
+    merger.add_page(['ALDRIC', 'BRENNA', 'CASSIUS'])
+    # CASSIUS read again at the top of the next page, with one letter wrong
+    assert merger.add_page(['BRENNA', 'CASSlUS', 'DORIAN']) == ['DORIAN']
+    assert merger.names == ['ALDRIC', 'BRENNA', 'CASSIUS', 'DORIAN']
+
+
+def test_page_starting_one_letter_away_is_not_an_overlap():
+    merger = ScrollMerger()
+    merger.add_page(NEAR_IDENTICAL[:3])
+    assert merger.add_page(['KNIGHTD', 'KNIGHTE']) == ['KNIGHTD', 'KNIGHTE']
+
+
+def test_scroll_merger_stops_on_a_repeated_page():
+    merger = ScrollMerger()
+    merger.add_page(NEAR_IDENTICAL)
+    merger.add_page(NEAR_IDENTICAL)
+    assert merger.exhausted
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the grandparent directory to Python path, like the scripts at the package root
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from Emperor.utils.regions import RegionRegistry, record_window
+
+
+PICKED = "names\n Selected coordinates: (58, 240) to (400, 1016)\n"
+
+
+def test_lane_regions_follow_their_own_window(tmp_path):
+    path = tmp_path / 'regions'
+    path.write_text(PICKED, encoding='utf-8')
+    record_window((0, 0, 1280, 1024), path)
+
+    first, second = RegionRegistry.for_lane(path), RegionRegistry.for_lane(path)
+    first.update_window(0, 0, 1280, 1024)
+    second.update_window(1280, 0, 1280, 1024)
+    assert first['names'] == (58, 240, 400, 1016)
+    assert second['names'] == (1338, 240, 1680, 1016)
+
+
+def test_lanes_refuse_regions_without_a_picked_window(tmp_path):
+    path = tmp_path / 'regions'
+    path.write_text(PICKED, encoding='utf-8')
+    with pytest.raises(RuntimeError):
+        RegionRegistry.for_lane(path)
+
+
+def test_single_client_records_the_first_window(tmp_path):
+    path = tmp_path / 'regions'
+    path.write_text(PICKED, encoding='utf-8')
+    registry = RegionRegistry.from_file(path)
+    registry.update_window(100, 50, 1280, 1024)
+    assert registry['names'] == (58, 240, 400, 1016)
+
+    lane = RegionRegistry.for_lane(path)
+    lane.update_window(1380, 50, 1280, 1024)
+    assert lane['names'] == (1338, 240, 1680, 1016)
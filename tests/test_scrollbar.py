@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the grandparent directory to Python path, like the scripts at the package root
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from Emperor.utils.scrollbar import thumb_at_bottom, thumb_span
+
+
+TRACK, THUMB = 40, 160
+
+
+def scrollbar(total, page, height=780, width=29, per_page=20):
+    """A synthetic scroll region for page `page` of a list of `total` results"""
+    frame = np.full((height, width, 3), TRACK, np.uint8)
+    length = round(height * min(1.0, per_page / total))
+    last_page = -(-total // per_page) - 1
+    top = round((height - length) * min(page, last_page) / last_page) if last_page else 0
+    frame[top:top + length, 2:-2] = THUMB
+    return frame
+
+
+@pytest.mark.parametrize('total', [25, 30, 39, 60, 100])
+def test_thumb_at_bottom_only_on_the_last_page(total):
+    pages = -(-total // 20)
+    assert [thumb_at_bottom(scrollbar(total, page)) for page in range(pages)] == [False] * (pages - 1) + [True]
+
+
+def test_long_thumb_is_not_taken_for_the_track():
+    top, bottom = thumb_span(scrollbar(25, 0))
+    assert top == 0.0
+    assert bottom == pytest.approx(0.8, abs=0.01)
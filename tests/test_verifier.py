@@ -0,0 +1,98 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the grandparent directory to Python path, like the scripts at the package root
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from Emperor.utils.verifier import InviteVerifier, NOT_FOUND, SUCCESS, UNKNOWN
+
+
+def glyphs(word, height=12):
+    """A fixed random bitmap per word, standing in for its rendered text"""
+    rng = np.random.default_rng(sum(map(ord, word)) * 7919 + len(word))
+    bitmap = rng.random((height, 6 * len(word))) > 0.5
+    bitmap[0, :] = bitmap[-1, :] = True
+    return bitmap
+
+
+def message(text, width=400, height=20):
+    """The invites region showing one line of text"""
+    frame = np.full((height, width, 3), 20, np.uint8)
+    x = 4
+    for word in text.split():
+        bitmap = glyphs(word)
+        frame[4:4 + bitmap.shape[0], x:x + bitmap.shape[1]][bitmap] = 230
+        x += bitmap.shape[1] + 8
+    return frame
+
+
+class Reader:
+    """OCR stand-in that knows which text was drawn into each frame"""
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.reads = 0
+
+    def readtext(self, frame, detail=0, paragraph=True):
+        self.reads += 1
+        return [self.screen.text]
+
+
+class Screen:
+    def __init__(self, text=''):
+        self.text = text
+        self.frame = message(text)
+        self.lock = threading.Lock()
+
+    def show(self, text):
+        with self.lock:
+            self.text, self.frame = text, message(text)
+
+    def grab(self):
+        with self.lock:
+            return self.frame.copy()
+
+
+def verify(screen, replies, **kwargs):
+    """Run the verifier over invites whose replies appear a little after they are submitted"""
+    reader = Reader(screen)
+    results = []
+    verifier = InviteVerifier(screen.grab, reader, interval=0.01,
+                              on_result=lambda name, outcome, retried: results.append((name, outcome)), **kwargs)
+    verifier.start()
+    for name, reply in replies:
+        verifier.submit(name)
+        if reply is not None:
+            time.sleep(0.05)
+            screen.show(reply)
+        time.sleep(0.1)
+    verifier.join()
+    verifier.stop()
+    return results, reader.reads
+
+
+def test_replies_for_other_names_reuse_the_first_read():
+    screen = Screen()
+    names = ['Aldric', 'Bo', 'Catherine', 'Dunmore']
+    results, reads = verify(screen, [(name, f"{name} has been invited") for name in names])
+    assert results == [(name, SUCCESS) for name in names]
+    assert reads == 1
+
+
+def test_waits_for_the_reply_to_each_invite():
+    screen = Screen("Zed has been invited")
+    replies = [('Aldric', "Player Aldric not found"), ('Bo', "Bo has been invited"),
+               ('Cato', "Player Cato not found")]
+    results, reads = verify(screen, replies)
+    assert results == [('Aldric', NOT_FOUND), ('Bo', SUCCESS), ('Cato', NOT_FOUND)]
+    assert reads == 2
+
+
+def test_no_reply_is_unknown():
+    screen = Screen("Zed has been invited")
+    results, _ = verify(screen, [('Aldric', None)], timeout=0.2)
+    assert results == [('Aldric', UNKNOWN)]
@@ -1,12 +1,35 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QShortcut)
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QKeySequence
 from Emperor.ui.panels import ControlPanel, StatsPanel, ButtonPanel, LogConsole
 from Emperor.utils.config_manager import ConfigManager
-import pygetwindow as gw
+from Emperor.utils.ocr_pool import OCRPool, reader_options
+from Emperor.utils.regions import RegionRegistry, WindowLocator
+from Emperor.utils.capture import ScreenBackend
+from Emperor.utils.verifier import InviteVerifier, SUCCESS, UNKNOWN
+from Emperor.utils.dispatcher import InviteDispatcher, default_sender
+from Emperor.utils.ledger import InviteLedger
+from Emperor.utils.cooldown import CooldownIndex
+from Emperor.utils.engine import RecruitmentEngine, IDLE, PAUSED
+from Emperor.utils.focus import FocusMonitor, default_backend
+from Emperor.utils.sweep import SweepScheduler
+from Emperor.utils.session import SessionCheckpoint
+from Emperor.utils.orchestrator import Orchestrator, DesktopWindows, InputLane, SharedInvites, Lane
+from Emperor.test import TestExtraction, NAME_ALLOWLIST
 
 
 class MainWindow(QMainWindow):
+    # Emitted from the pool warm-up thread, delivered on the GUI thread
+    ocr_ready = pyqtSignal(float)
+    ocr_failed = pyqtSignal(str)
+    # Emitted from the invite verifier thread: name, outcome, queued for retry
+    invite_verified = pyqtSignal(str, str, bool)
+    # Emitted from the recruitment engine thread, once per pipeline step
+    engine_batch = pyqtSignal(list, dict)
+    engine_state = pyqtSignal(str)
+    # Emitted from the focus monitor thread after the engine has already been paused
+    focus_changed = pyqtSignal(bool)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("SWTOR Guild Recruiter")
@@ -23,12 +46,26 @@ class MainWindow(QMainWindow):
         self.recruits_count = 0
         self.total_processed = 0
         self.failed_invites = 0
+        # Invites whose reply could not be read; neither recruits nor failures
+        self.unverified_invites = 0
+
+        # Worker-thread engine; the GUI thread only sees it through signals
+        self.engine = None
+        self.engine_status = IDLE
+        self.ledger = None
+
+        # Cached game window handle, re-enumerated only when it goes stale
+        self.window_locator = WindowLocator()
 
         self.init_ui()
         self.setup_hotkeys()
         self.setup_connections()
         self.setup_timers()
+        self.setup_focus_monitor()
         self.restore_window_state()
+        self.start_ocr_pool()
+        self.setup_invite_verifier()
+        self.restore_session()
 
     def init_ui(self):
         central_widget = QWidget()
@@ -39,7 +76,7 @@ class MainWindow(QMainWindow):
         self.control_panel = ControlPanel(self)
         self.stats_panel = StatsPanel(self)
         self.button_panel = ButtonPanel(self)
-        self.log_console = LogConsole(self)
+        self.log_console = LogConsole(self, log_file=self.config_manager.config.get('log_file'))
 
         # Add panels to main layout
         main_layout.addWidget(self.control_panel)
@@ -58,27 +95,227 @@ class MainWindow(QMainWindow):
         self.button_panel.stop_button.clicked.connect(self.stop_recruitment)
         self.button_panel.pause_button.clicked.connect(self.toggle_pause)
 
-    def setup_timers(self):
-        # Game window monitoring timer
-        self.game_check_timer = QTimer()
-        self.game_check_timer.timeout.connect(self.check_game_window)
-        self.game_check_timer.start(1000)  # Check every second
+        # OCR pool warm-up results
+        self.ocr_ready.connect(self.on_ocr_ready)
+        self.ocr_failed.connect(self.on_ocr_failed)
+        self.invite_verified.connect(self.on_invite_verified)
+
+        # Recruitment engine updates
+        self.engine_batch.connect(self.on_engine_batch)
+        self.engine_state.connect(self.on_engine_state)
+        self.focus_changed.connect(self.on_focus_changed)
 
+    def setup_timers(self):
         # Auto-save timer
         self.auto_save_timer = QTimer()
         self.auto_save_timer.timeout.connect(self.auto_save)
         self.auto_save_timer.start(30000)  # Save every 30 seconds
 
+    def setup_focus_monitor(self):
+        # Foreground hook on Windows, adaptive polling otherwise; replaces the 1s timer poll
+        self.focus_monitor = FocusMonitor(default_backend(self.window_locator))
+        self.focus_monitor.add_listener(self.on_focus_event)
+        self.focus_monitor.start()
+
+    def on_focus_event(self, focused):
+        # Monitor thread: stop input right away, then let the GUI catch up. The engine
+        # resumes by itself when the game is back in front; lanes bring their own windows forward
+        if not focused and self.engine and self.engine.is_running and hasattr(self.engine, 'focus_lost'):
+            self.engine.focus_lost()
+        self.focus_changed.emit(focused)
+
+    def on_focus_changed(self, focused):
+        if not hasattr(self.engine, 'focus_lost'):
+            return
+        if not focused and self.is_running and not self.is_paused:
+            self.is_paused = True
+            self.log_console.log_message("Game window lost focus - Paused", "yellow")
+            self.update_status()
+
+    def start_ocr_pool(self):
+        settings = self.config_manager.get_ocr_settings()
+        options = reader_options(settings['mode'], settings['workers'], NAME_ALLOWLIST, settings['threads'])
+        self.ocr_pool = OCRPool(workers=settings['workers'], cpu_only=settings['cpu_only'], **options)
+        self.log_console.log_message(f"Loading OCR models ({settings['workers']} worker(s), "
+                                     f"{settings['mode']} mode: {', '.join(options['languages'])})...")
+        self.ocr_pool.start_async(
+            on_ready=self.ocr_ready.emit,
+            on_error=lambda e: self.ocr_failed.emit(str(e))
+        )
+
+    def on_ocr_ready(self, startup_time):
+        self.log_console.log_message(f"OCR ready in {startup_time:.1f}s", "green")
+
+    def on_ocr_failed(self, error):
+        self.log_console.log_message(f"Error loading OCR: {error}", "red")
+
+    def setup_invite_verifier(self):
+        # Its own capture backend, so verifier grabs never share a buffer with the name scans
+        screen = ScreenBackend(RegionRegistry.from_file(), locator=self.window_locator)
+        self.invite_verifier = InviteVerifier(
+            lambda: screen.grab('invites'),
+            self.ocr_pool,
+            on_result=self.invite_verified.emit
+        ).start()
+
+    def on_invite_verified(self, name, outcome, retried):
+        if outcome == SUCCESS:
+            self.recruits_count += 1
+        elif outcome == UNKNOWN:
+            self.unverified_invites += 1
+            self.log_console.log_message(f"Could not read the reply to the invite to {name}", "yellow")
+        else:
+            self.failed_invites += 1
+            note = " - will retry" if retried else ""
+            self.log_console.log_message(f"Invite to {name} failed ({outcome}){note}", "red")
+        self.update_status()
+
+    def create_engine(self, range_width):
+        settings = self.config_manager.get_invite_settings()
+        if self.ledger is None:
+            self.ledger = InviteLedger(settings['ledger_path'])
+        cooldown = CooldownIndex.from_ledger(self.ledger, days=settings['cooldown_days'])
+
+        def on_sent(name):
+            self.ledger.record(name)
+            cooldown.record(name)
+            self.invite_verifier.submit(name)
+            engine.invited(name)
+
+        def on_error(name, error):
+            engine.log(f"Error inviting {name}: {str(error)}", "red")
+
+        dispatcher = InviteDispatcher(
+            sender=default_sender(settings['paste']),
+            rate_per_minute=settings['rate_per_minute'],
+            ceiling_per_minute=settings['ceiling_per_minute'],
+            jitter=settings['jitter'],
+            on_sent=on_sent,
+            on_error=on_error,
+            can_send=lambda: self.focus_monitor.is_focused,
+            max_pending=settings['max_pending'],
+            spill_path=settings['spill_path']
+        )
+        scanner = TestExtraction(ocr_pool=self.ocr_pool)
+        scheduler = SweepScheduler(range_width)
+        snapshot, elapsed = self.session.sweep_snapshot()
+        if snapshot:
+            scheduler.restore(snapshot, elapsed)
+        engine = RecruitmentEngine(
+            scanner.scan,
+            dispatcher,
+            scheduler,
+            filter_names=cooldown.filter_eligible,
+            retry_queue=self.invite_verifier.retry_queue,
+            verifier=self.invite_verifier,
+            on_batch=self.engine_batch.emit,
+            on_state=self.engine_state.emit,
+            session=self.session,
+            focus=self.focus_monitor,
+            activate=self.window_locator.activate
+        )
+        # Keep counting from where the last session left off
+        engine.stats['processed'] = self.total_processed
+        return engine
+
+    def create_orchestrator(self, range_width):
+        """One lane per game window, sharing the OCR pool, the ranges and the invite ledger"""
+        settings = self.config_manager.get_invite_settings()
+        if self.ledger is None:
+            self.ledger = InviteLedger(settings['ledger_path'])
+        invites = SharedInvites(CooldownIndex.from_ledger(self.ledger, days=settings['cooldown_days']), self.ledger)
+        scheduler = SweepScheduler(range_width)
+        orchestrator = Orchestrator(
+            DesktopWindows(),
+            lambda orchestrator, index, window: self.build_lane(orchestrator, index, window, invites, settings),
+            scheduler,
+            on_batch=self.engine_batch.emit,
+            on_state=self.engine_state.emit
+        )
+        orchestrator.base_processed = self.total_processed
+        return orchestrator
+
+    def build_lane(self, orchestrator, index, window, invites, settings):
+        """Capture, input, verifier and engine for one game window"""
+        locator = WindowLocator(window=window)
+        registry = RegionRegistry.for_lane()
+        lane_input = InputLane(ScreenBackend(registry, locator=locator), window, orchestrator.windows,
+                               orchestrator.input_lock, sender=default_sender(settings['paste']))
+        # Every client shows the replies to its own invites
+        screen = ScreenBackend(RegionRegistry.for_lane(), locator=locator)
+        verifier = InviteVerifier(
+            lambda: screen.grab('invites'),
+            self.ocr_pool,
+            on_result=self.invite_verified.emit
+        ).start()
+        scanner = TestExtraction(ocr_pool=self.ocr_pool, capture_backend=lane_input,
+                                 registry=registry, window_locator=locator)
+
+        def on_sent(name):
+            invites.sent(name)
+            verifier.submit(name)
+            engine.invited(name)
+
+        def on_error(name, error):
+            engine.log(f"Error inviting {name}: {str(error)}", "red")
+
+        dispatcher = InviteDispatcher(
+            sender=lane_input,
+            rate_per_minute=settings['rate_per_minute'],
+            ceiling_per_minute=settings['ceiling_per_minute'],
+            jitter=settings['jitter'],
+            on_sent=on_sent,
+            on_error=on_error,
+            max_pending=settings['max_pending'],
+            spill_path=settings['spill_path'] and f"{settings['spill_path']}.{index + 1}"
+        )
+        engine = RecruitmentEngine(
+            scanner.scan,
+            dispatcher,
+            orchestrator.ranges,
+            filter_names=lambda names: invites.claim(names, index),
+            retry_queue=verifier.retry_queue,
+            verifier=verifier,
+            **orchestrator.lane_callbacks(index)
+        )
+        return Lane(index, window, engine, dispatcher, verifier, lane_input)
+
     def start_recruitment(self):
+        if self.engine and self.engine.is_running:
+            if self.is_paused:
+                self.toggle_pause()
+            return
         if not self.validate_input():
             return
+        if not self.ocr_pool.is_ready:
+            self.log_console.log_message("OCR models are still loading, try again shortly", "yellow")
+            return
 
+        range_width = int(self.control_panel.range_input.text())
+        if self.config_manager.config.get('multi_client'):
+            self.engine = self.create_orchestrator(range_width)
+            try:
+                lanes = self.engine.start()
+            except RuntimeError as e:
+                self.log_console.log_message(str(e), "red")
+                return
+            if not lanes:
+                self.log_console.log_message("No game windows found", "red")
+                return
+            self.log_console.log_message(f"Running {lanes} game client(s)", "green")
+        else:
+            self.stats_panel.update_lanes([])
+            self.engine = self.create_engine(range_width)
+            self.engine.start()
         self.is_running = True
         self.is_paused = False
         self.update_status()
         self.log_console.log_message("Recruitment started", "green")
 
     def stop_recruitment(self):
+        # The engine stops at its next checkpoint and reports back as idle
+        if self.engine:
+            self.engine.stop()
         self.is_running = False
         self.is_paused = False
         self.update_status()
@@ -87,10 +324,39 @@ class MainWindow(QMainWindow):
     def toggle_pause(self):
         if self.is_running:
             self.is_paused = not self.is_paused
+            if self.engine:
+                if self.is_paused:
+                    self.engine.pause()
+                else:
+                    self.engine.resume()
             status = "paused" if self.is_paused else "resumed"
             self.log_console.log_message(f"Recruitment {status}", "yellow")
             self.update_status()
 
+    def on_engine_batch(self, logs, stats):
+        for message, color in logs:
+            self.log_console.log_message(message, color)
+        self.total_processed = stats.get('processed', self.total_processed)
+        self.current_range = stats.get('current_range', self.current_range)
+        if 'next_range' in stats:
+            self.control_panel.next_range_label.setText(f"Next range will be: {stats['next_range']}")
+        if 'lanes' in stats:
+            self.stats_panel.update_lanes(stats['lanes'], stats['rate'])
+        self.update_status()
+
+    def on_engine_state(self, state):
+        previous, self.engine_status = self.engine_status, state
+        if state == IDLE:
+            self.is_running = False
+            self.is_paused = False
+        elif state == PAUSED and self.is_running:
+            # Paused from its own thread, e.g. focus was already gone on resume
+            self.is_paused = True
+        elif previous == PAUSED and self.is_running:
+            # Back at work, e.g. resumed by itself when the game got focus again
+            self.is_paused = False
+        self.update_status()
+
     def validate_input(self):
         try:
             range_value = int(self.control_panel.range_input.text())
@@ -103,31 +369,17 @@ class MainWindow(QMainWindow):
             return False
 
     def update_status(self):
-        status = "Paused" if self.is_paused else "Running" if self.is_running else "Stopped"
+        status = "Paused" if self.is_paused else self.engine_status.title() if self.is_running else "Stopped"
         stats = {
             'current_range': self.current_range or '--',
             'recruits': self.recruits_count,
             'processed': self.total_processed,
             'failed': self.failed_invites,
+            'unverified': self.unverified_invites,
             'status': status
         }
         self.stats_panel.update_stats(stats)
 
-    def check_game_window(self):
-        if self.is_running and not self.is_paused:
-            swtor_window = None
-            try:
-                for window in gw.getWindowsWithTitle("Star Wars™: The Old Republic™"):
-                    if "Star Wars™: The Old Republic™" in window.title:
-                        swtor_window = window
-                        break
-
-                if not swtor_window or not swtor_window.isActive:
-                    self.toggle_pause()
-                    self.log_console.log_message("Game window lost focus - Paused", "yellow")
-            except Exception as e:
-                self.log_console.log_message(f"Error checking game window: {str(e)}", "red")
-
     def auto_save(self):
         if self.is_running or self.is_paused:
             self.config_manager.save_state({
@@ -136,13 +388,43 @@ class MainWindow(QMainWindow):
                 'current_range': self.current_range,
                 'recruits_count': self.recruits_count,
                 'total_processed': self.total_processed,
-                'failed_invites': self.failed_invites
+                'failed_invites': self.failed_invites,
+                'unverified_invites': self.unverified_invites
             })
 
     def closeEvent(self, event):
         self.config_manager.save_window_geometry(self.pos(), self.size())
+        self.config_manager.close()
+        if self.engine:
+            self.engine.stop(timeout=2.0)
+        self.invite_verifier.stop()
+        self.focus_monitor.stop()
+        if self.ledger:
+            self.ledger.close()
+        self.session.close()
+        self.ocr_pool.shutdown(wait=False)
         super().closeEvent(event)
 
+    def restore_session(self):
+        """Reload the counters and any unfinished range, pending invites and retries"""
+        state = self.config_manager.get_state()
+        self.current_range = state.get('current_range')
+        self.recruits_count = state.get('recruits_count', 0)
+        self.total_processed = state.get('total_processed', 0)
+        self.failed_invites = state.get('failed_invites', 0)
+        self.unverified_invites = state.get('unverified_invites', 0)
+
+        self.session = SessionCheckpoint(self.config_manager.config.get('session_path', 'session.json'))
+        retries = self.session.restore_retries(self.invite_verifier.retry_queue)
+        resume = self.session.resume_range()
+        if resume:
+            level_range, scanned, pages, queue = resume
+            self.log_console.log_message(
+                f"Unfinished session at range {level_range[0]}-{level_range[1]} "
+                f"({len(pages)} page(s) read, {len(queue)} invite(s) pending, {retries} retries) - "
+                f"press Start to resume", "yellow")
+        self.update_status()
+
     def restore_window_state(self):
         geometry = self.config_manager.get_window_geometry()
         if geometry:
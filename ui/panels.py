@@ -1,11 +1,28 @@
 from PyQt5.QtWidgets import (QComboBox, QLineEdit, QPushButton, QTextEdit,
                             QLabel, QGridLayout, QHBoxLayout)
-from PyQt5.QtGui import QFont, QColor
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont, QColor, QTextCharFormat, QTextCursor
+from PyQt5.QtCore import Qt, QTimer
+import logging
+from collections import deque
+from logging.handlers import RotatingFileHandler
 from datetime import datetime, timezone, timedelta
 from Emperor.ui.styled_widget import StyledWidget
 
 
+# Log timestamps are shown in UTC-4
+LOG_TIMEZONE = timezone(timedelta(hours=-4))
+
+LOG_COLORS = {
+    "black": "#000000",
+    "red": "#FF0000",
+    "green": "#008000",
+    "yellow": "#808000"
+}
+
+# Messages arriving within one frame are written together
+LOG_FLUSH_MS = 16
+
+
 class ControlPanel(StyledWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -66,6 +83,7 @@ class StatsPanel(StyledWidget):
             'recruits': QLabel("Recruits: 0"),
             'processed': QLabel("Total Processed: 0"),
             'failed': QLabel("Failed Invites: 0"),
+            'unverified': QLabel("Unverified Invites: 0"),
             'status': QLabel("Status: Stopped")
         }
 
@@ -75,11 +93,26 @@ class StatsPanel(StyledWidget):
             layout.addWidget(label, row, 0)
             row += 1
 
+        # One line per game client, only shown for multi-client runs
+        self.lanes_label = QLabel()
+        self.lanes_label.setFont(QFont('Consolas', 9))
+        self.lanes_label.setVisible(False)
+        layout.addWidget(self.lanes_label, row, 0)
+
     def update_stats(self, stats):
         for key, value in stats.items():
             if key in self.stats_labels:
                 self.stats_labels[key].setText(f"{key.replace('_', ' ').title()}: {value}")
 
+    def update_lanes(self, lanes, rate=0.0):
+        """Aggregate and per-lane invite rates; an empty list hides them"""
+        lines = [f"All lanes: {rate:.1f} invites/min"] if lanes else []
+        for lane in lanes:
+            lines.append(f"Lane {lane['lane']}: {lane['status']:<9} range {lane['current_range']:<7} "
+                         f"{lane['processed']:>5} sent  {lane['rate']:5.1f}/min")
+        self.lanes_label.setText("\n".join(lines))
+        self.lanes_label.setVisible(bool(lanes))
+
 
 class ButtonPanel(StyledWidget):
     def __init__(self, parent=None):
@@ -111,7 +144,14 @@ class ButtonPanel(StyledWidget):
 
 
 class LogConsole(QTextEdit):
-    def __init__(self, parent=None):
+    """Bounded, colored log view
+
+    Messages are queued and written in one edit block on the next frame, so a
+    burst of log lines costs one repaint. The document drops its oldest
+    blocks past `max_lines`, which keeps each append O(1).
+    """
+
+    def __init__(self, parent=None, log_file=None, max_bytes=1_000_000, backups=3):
         super().__init__(parent)
         self.main_window = parent
         self.setReadOnly(True)
@@ -124,23 +164,59 @@ class LogConsole(QTextEdit):
             }
         """)
         self.max_lines = 100
+        self.document().setMaximumBlockCount(self.max_lines)
+
+        self.formats = {}
+        for name, value in LOG_COLORS.items():
+            text_format = QTextCharFormat()
+            text_format.setForeground(QColor(value))
+            self.formats[name] = text_format
+
+        # Only the newest max_lines can survive the next flush anyway
+        self.pending = deque(maxlen=self.max_lines)
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.flush)
+
+        # Optional copy of the log on disk, rotated at `max_bytes`
+        self.file_logger = None
+        if log_file:
+            handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self.file_logger = logging.getLogger(f"{__name__}.{id(self)}")
+            self.file_logger.propagate = False
+            self.file_logger.addHandler(handler)
+            self.file_logger.setLevel(logging.INFO)
 
     def log_message(self, message, color="black"):
-        current_time = datetime.now(timezone(timedelta(hours=-4))).strftime("%m/%d/%Y %I:%M:%S %p")
+        current_time = datetime.now(LOG_TIMEZONE).strftime("%m/%d/%Y %I:%M:%S %p")
         formatted_message = f"[{current_time}] {message}"
 
-        colors = {
-            "black": "#000000",
-            "red": "#FF0000",
-            "green": "#008000",
-            "yellow": "#808000"
-        }
-
-        self.setTextColor(QColor(colors.get(color, "#000000")))
-        self.append(formatted_message)
-
-        # Limit to 100 lines
-        text = self.toPlainText()
-        lines = text.split('\n')
-        if len(lines) > self.max_lines:
-            self.setPlainText('\n'.join(lines[-self.max_lines:]))
\ No newline at end of file
+        self.pending.append((formatted_message, color))
+        if self.file_logger:
+            self.file_logger.info(formatted_message)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start(LOG_FLUSH_MS)
+
+    def flush(self):
+        """Write queued messages at the end of the document in one edit block"""
+        if not self.pending:
+            return
+        messages = list(self.pending)
+        self.pending.clear()
+
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        for message, color in messages:
+            if not self.document().isEmpty():
+                cursor.insertBlock()
+            cursor.insertText(message, self.formats.get(color, self.formats['black']))
+        cursor.endEditBlock()
+
+        # Follow new messages unless the user scrolled up to read
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
@@ -1,3 +1,63 @@
 from .config_manager import ConfigManager
+from .ocr_pool import OCRPool
+from .pipeline import CapturePipeline, StageTimer
+from .settle import SettleDetector, FrameSequence
+from .rows import RowRecognizer
+from .recorder import FrameRecorder
+from .frame_grabber import FrameGrabber
+from .capture import ScreenBackend, ReplayBackend
+from .regions import RegionRegistry, WindowLocator
+from .ledger import InviteLedger
+from .cooldown import CooldownIndex
+from .names import NameCanonicalizer, ScrollMerger, merge_pages, sort_names
+from .dispatcher import InviteDispatcher, TokenBucket
+from .verifier import InviteVerifier, RetryQueue
+from .engine import RecruitmentEngine
+from .sweep import SweepScheduler, SimulatedPopulation
+from .session import SessionCheckpoint
+from .digits import DigitReader
+from .focus import FocusMonitor
+from .orchestrator import Orchestrator, SharedInvites, FakeWindows
+from .handoff import NameStream, NameLog, follow_names
+from .preprocess import Profile, PROFILES, REGION_PROFILES
 
-__all__ = ['ConfigManager']
\ No newline at end of file
+__all__ = [
+    'ConfigManager',
+    'OCRPool',
+    'CapturePipeline',
+    'StageTimer',
+    'SettleDetector',
+    'FrameSequence',
+    'RowRecognizer',
+    'FrameRecorder',
+    'FrameGrabber',
+    'ScreenBackend',
+    'ReplayBackend',
+    'RegionRegistry',
+    'WindowLocator',
+    'InviteLedger',
+    'CooldownIndex',
+    'NameCanonicalizer',
+    'ScrollMerger',
+    'merge_pages',
+    'sort_names',
+    'InviteDispatcher',
+    'TokenBucket',
+    'InviteVerifier',
+    'RetryQueue',
+    'RecruitmentEngine',
+    'SweepScheduler',
+    'SimulatedPopulation',
+    'SessionCheckpoint',
+    'DigitReader',
+    'FocusMonitor',
+    'Orchestrator',
+    'SharedInvites',
+    'FakeWindows',
+    'NameStream',
+    'NameLog',
+    'follow_names',
+    'Profile',
+    'PROFILES',
+    'REGION_PROFILES'
+]
\ No newline at end of file
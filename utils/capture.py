@@ -0,0 +1,157 @@
+import io
+import json
+import os
+import re
+import zipfile
+from collections import defaultdict
+import numpy as np
+from Emperor.utils.frame_grabber import FrameGrabber
+
+
+# <region>_<sequence>.<ext>, as written by FrameRecorder
+FRAME_NAME = re.compile(r'^(?P<region>.+)_(?P<sequence>\d+)\.(?P<ext>png|npy)$')
+
+
+class ScreenBackend:
+    """Live capture of the game area through a FrameGrabber and input through pyautogui"""
+
+    def __init__(self, regions, source=None, locator=None):
+        # A RegionRegistry follows the game window through `locator`; a plain dict is fixed
+        self.registry = regions
+        self.locator = locator
+        self.grabber = FrameGrabber(self.regions, source)
+
+    @property
+    def regions(self):
+        return getattr(self.registry, 'regions', self.registry)
+
+    def follow_window(self):
+        """Re-resolve the regions if the game window moved or was resized"""
+        if self.locator is None or not hasattr(self.registry, 'update_window'):
+            return
+        rect = self.locator.rect()
+        if rect and self.registry.update_window(*rect):
+            self.grabber.set_regions(self.registry.regions)
+
+    def grab(self, region_name):
+        return self.grab_regions(region_name)[region_name]
+
+    def grab_regions(self, *region_names):
+        """Several regions cut from one screen capture"""
+        self.follow_window()
+        return self.grabber.grab(*region_names)
+
+    def move_to(self, x, y):
+        # Imported here so replay-only tools work on machines without a display
+        import pyautogui
+        pyautogui.moveTo(x, y)
+
+    def scroll(self, amount):
+        import pyautogui
+        pyautogui.scroll(amount)
+
+    def click(self, x, y):
+        import pyautogui
+        pyautogui.click(x, y)
+
+    def type_text(self, text):
+        """Replace the contents of the focused field with `text` and submit it"""
+        import pyautogui
+        pyautogui.hotkey('ctrl', 'a')
+        pyautogui.write(text, interval=0)
+        pyautogui.press('enter')
+
+
+class ReplayBackend:
+    """Serves frames recorded by FrameRecorder from a session directory
+
+    Every region has a cursor. grab() keeps returning the current frame, and
+    scroll() moves the list regions on to their next recorded page.
+    """
+
+    # Regions that change when the /who list is scrolled
+    LIST_REGIONS = ('names', 'scroll')
+
+    def __init__(self, session_dir):
+        self.session_dir = session_dir
+        self.frames = defaultdict(list)
+        self.cursors = defaultdict(int)
+        self.truth = None
+        self._load()
+
+    def _load(self):
+        found = []
+        for name in os.listdir(self.session_dir):
+            path = os.path.join(self.session_dir, name)
+            if name.endswith('.zip'):
+                with zipfile.ZipFile(path) as archive:
+                    for entry in archive.namelist():
+                        match = FRAME_NAME.match(entry)
+                        if match:
+                            frame = np.load(io.BytesIO(archive.read(entry)))
+                            found.append((match, frame))
+            else:
+                match = FRAME_NAME.match(name)
+                if match:
+                    found.append((match, self._load_file(path)))
+
+        for match, frame in sorted(found, key=lambda item: int(item[0].group('sequence'))):
+            self.frames[match.group('region')].append(frame)
+
+        if not self.frames:
+            raise ValueError(f"No recorded frames found in {self.session_dir}")
+
+        truth_path = os.path.join(self.session_dir, 'truth.json')
+        if os.path.exists(truth_path):
+            with open(truth_path, 'r', encoding='utf-8') as f:
+                self.truth = json.load(f)
+
+    @staticmethod
+    def _load_file(path):
+        if path.endswith('.npy'):
+            return np.load(path)
+        from PIL import Image
+        with Image.open(path) as image:
+            return np.array(image.convert('RGB'))
+
+    def page_count(self, region_name='names'):
+        return len(self.frames.get(region_name, []))
+
+    def grab(self, region_name):
+        frames = self.frames.get(region_name)
+        if not frames:
+            raise KeyError(f"Session {self.session_dir} has no frames for region '{region_name}'")
+        return frames[min(self.cursors[region_name], len(frames) - 1)]
+
+    def grab_regions(self, *region_names):
+        """Recorded frames for the regions this session has; missing ones are left out"""
+        return {name: self.grab(name) for name in region_names if self.frames.get(name)}
+
+    def move_to(self, x, y):
+        pass
+
+    def click(self, x, y):
+        pass
+
+    def type_text(self, text):
+        pass
+
+    def scroll(self, amount):
+        for region_name in self.LIST_REGIONS:
+            self.cursors[region_name] += 1
+
+    def rewind(self):
+        self.cursors.clear()
+
+
+def find_sessions(path):
+    """Session directories under `path`, or `path` itself if it holds frames"""
+    def has_frames(directory):
+        return any(FRAME_NAME.match(name) or name.endswith('.zip') for name in os.listdir(directory))
+
+    if has_frames(path):
+        return [path]
+    return sorted(
+        os.path.join(path, name) for name in os.listdir(path)
+        if os.path.isdir(os.path.join(path, name)) and has_frames(os.path.join(path, name))
+    )
@@ -1,39 +1,128 @@
 import json
+import os
+import threading
 from PyQt5.QtCore import QPoint, QSize
 
 
 class ConfigManager:
-    def __init__(self):
-        self.config_file = 'config.json'
+    """config.json with debounced, atomic writes from a background thread
+
+    Setters only change the in-memory config and mark it dirty. The writer
+    thread folds every change made within `debounce` seconds into one write,
+    skips it if the serialized content matches what is already on disk, and
+    replaces the file through a temp file so a crash never leaves it half
+    written. flush() writes immediately and is called on exit.
+    """
+
+    def __init__(self, config_file='config.json', debounce=2.0):
+        self.config_file = config_file
+        self.debounce = debounce
+        self.writes = 0
+
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._written = None
+        self._wake = threading.Event()
+        self._closing = threading.Event()
+        self._writer = threading.Thread(target=self._run, name="config-writer", daemon=True)
+        self._writer.start()
+
         self.load_config()
 
     def load_config(self):
         try:
             with open(self.config_file, 'r') as f:
-                self.config = json.load(f)
-        except FileNotFoundError:
+                text = f.read()
+            self.config = json.loads(text)
+            self._written = text
+        except (FileNotFoundError, ValueError):
             self.config = {
                 'window_geometry': None,
                 'last_range': '',
                 'faction': "Light Side",
                 'total_recruits': 0,
+                'log_file': None,
+                'session_path': 'session.json',
+                'multi_client': False,
+                'ocr': {
+                    'workers': 1,
+                    'cpu_only': True,
+                    'mode': 'cpu',
+                    'threads': None
+                },
+                'invites': {
+                    'rate_per_minute': 40,
+                    'ceiling_per_minute': 60,
+                    'jitter': 0.25,
+                    'paste': True,
+                    'ledger_path': 'dnd.json',
+                    'cooldown_days': 7,
+                    'max_pending': 40,
+                    'spill_path': None
+                },
                 'state': {
                     'is_running': False,
                     'is_paused': False,
                     'current_range': None,
                     'recruits_count': 0,
                     'total_processed': 0,
-                    'failed_invites': 0
+                    'failed_invites': 0,
+                    'unverified_invites': 0
                 }
             }
             self.save_config()
 
     def save_config(self):
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=4)
+        """Mark the config dirty; the writer thread saves it after the debounce window"""
+        with self._lock:
+            self._dirty = True
+        self._wake.set()
+
+    def flush(self):
+        """Write pending changes now, on the calling thread"""
+        self._write()
+
+    def close(self):
+        self._closing.set()
+        self._wake.set()
+        self._writer.join(timeout=2.0)
+        self.flush()
+
+    def _run(self):
+        while not self._closing.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            # Let changes made in the next few moments join this write
+            if self._closing.wait(self.debounce):
+                break
+            self._write()
+
+    def _write(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            text = json.dumps(self.config, indent=4)
+            self._dirty = False
+            if text == self._written:
+                return
+
+            temp_path = f"{self.config_file}.tmp"
+            try:
+                with open(temp_path, 'w') as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.config_file)
+            except OSError as e:
+                self._dirty = True
+                print(f"Error saving config: {str(e)}")
+                return
+            self._written = text
+            self.writes += 1
 
     def save_window_geometry(self, pos, size):
-        self.config['window_geometry'] = [pos.x(), pos.y(), size.width(), size.height()]
+        with self._lock:
+            self.config['window_geometry'] = [pos.x(), pos.y(), size.width(), size.height()]
         self.save_config()
 
     def get_window_geometry(self):
@@ -41,12 +130,25 @@ class ConfigManager:
         return geometry if geometry else None
 
     def save_faction(self, faction):
-        self.config['faction'] = faction
+        with self._lock:
+            self.config['faction'] = faction
         self.save_config()
 
     def save_state(self, state):
-        self.config['state'] = state
+        with self._lock:
+            self.config['state'] = state
         self.save_config()
 
     def get_state(self):
-        return self.config.get('state', {})
\ No newline at end of file
+        return self.config.get('state', {})
+
+    def get_ocr_settings(self):
+        settings = {'workers': 1, 'cpu_only': True, 'mode': 'cpu', 'threads': None}
+        settings.update(self.config.get('ocr', {}))
+        return settings
+
+    def get_invite_settings(self):
+        settings = {'rate_per_minute': 40, 'ceiling_per_minute': 60, 'jitter': 0.25, 'paste': True,
+                    'ledger_path': 'dnd.json', 'cooldown_days': 7, 'max_pending': 40, 'spill_path': None}
+        settings.update(self.config.get('invites', {}))
+        return settings
\ No newline at end of file
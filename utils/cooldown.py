@@ -0,0 +1,102 @@
+import heapq
+import json
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from Emperor.utils.ledger import normalize_name
+
+
+DAY = 86400
+
+
+def date_to_timestamp(date):
+    """End of a 'YYYY-MM-DD' day, so a date-only record never expires early"""
+    return (datetime.strptime(date, '%Y-%m-%d') + timedelta(days=1)).timestamp()
+
+
+class CooldownIndex:
+    """Last invite time per normalized name, answering 'can we invite them again yet?'
+
+    Eligibility is a dict lookup and a compare. A min-heap of expiry times
+    lets expire() drop old names without scanning the whole map.
+    """
+
+    def __init__(self, days=7):
+        self.window = days * DAY
+        self.last = {}
+        self._heap = []
+
+    def record(self, name, when=None):
+        when = time.time() if when is None else when
+        key = normalize_name(name)
+        if when > self.last.get(key, float('-inf')):
+            self.last[key] = when
+            heapq.heappush(self._heap, (when + self.window, key))
+
+    def is_eligible(self, name, now=None):
+        last = self.last.get(normalize_name(name))
+        if last is None:
+            return True
+        now = time.time() if now is None else now
+        return last + self.window <= now
+
+    def filter_eligible(self, names, now=None):
+        """The names from a /who capture that are out of cooldown, order kept"""
+        names = list(names)
+        if not names:
+            return []
+        now = time.time() if now is None else now
+        last = self.last
+        invited = np.fromiter(
+            (last.get(normalize_name(name), -np.inf) for name in names),
+            dtype=np.float64, count=len(names)
+        )
+        eligible = invited + self.window <= now
+        return [name for name, ok in zip(names, eligible) if ok]
+
+    def expire(self, now=None):
+        """Forget names whose cooldown has run out; returns how many were dropped"""
+        now = time.time() if now is None else now
+        dropped = 0
+        while self._heap and self._heap[0][0] <= now:
+            expires, key = heapq.heappop(self._heap)
+            # Skip stale heap entries left behind by a newer invite
+            if self.last.get(key, float('-inf')) + self.window == expires:
+                del self.last[key]
+                dropped += 1
+        return dropped
+
+    def __len__(self):
+        return len(self.last)
+
+    @classmethod
+    def from_dnd(cls, dnd, days=7, now=None):
+        """Build from the dnd.json layout ({date: [names]}), or a path to it"""
+        if isinstance(dnd, str):
+            try:
+                with open(dnd, 'r', encoding='utf-8') as f:
+                    dnd = json.load(f)
+            except FileNotFoundError:
+                dnd = {}
+
+        index = cls(days)
+        now = time.time() if now is None else now
+        for date in sorted(dnd):
+            when = date_to_timestamp(date)
+            # Whole days that fell out of the window cannot block anyone
+            if when + index.window <= now:
+                continue
+            for name in dnd[date]:
+                index.record(name, when)
+        return index
+
+    @classmethod
+    def from_ledger(cls, ledger, days=7, now=None):
+        """Build from an InviteLedger, which already tracks each name's latest date"""
+        index = cls(days)
+        now = time.time() if now is None else now
+        for key, date in ledger.last_invited.items():
+            when = date_to_timestamp(date)
+            if when + index.window > now:
+                index.record(key, when)
+        return index
@@ -0,0 +1,219 @@
+import os
+import threading
+import numpy as np
+from Emperor.utils.preprocess import Threshold
+
+
+# Learned from the user's own screen, so kept beside config.json rather than in the package
+GLYPHS_FILE = 'glyphs.npz'
+
+# Glyphs are compared on this grid, whatever their size on screen
+GLYPH_SHAPE = (16, 10)
+
+
+def binarize(image):
+    """Otsu-thresholded ink mask; the text is whichever side has fewer pixels"""
+    image = np.asarray(image)
+    # Green alone carries most of the luminance and needs no conversion pass
+    gray = image[..., 1] if image.ndim == 3 else image.astype(np.uint8)
+    if gray.min() == gray.max():
+        return np.zeros(gray.shape, dtype=bool)
+    ink = gray > Threshold.otsu(gray)
+    if np.count_nonzero(ink) * 2 > ink.size:
+        ink = ~ink
+    return ink
+
+
+def connected_components(mask):
+    """Bounding boxes (top, bottom, left, right) of 8-connected ink blobs, ends exclusive
+
+    Runs of ink are found for the whole mask in one numpy pass; only the runs
+    are then labeled in Python, joining each to the runs it touches in the
+    row above.
+    """
+    padded = np.zeros((mask.shape[0], mask.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    run_rows, run_edges = np.nonzero(np.diff(padded, axis=1))
+    run_rows = run_rows[::2].tolist()
+    starts = run_edges[::2].tolist()
+    ends = run_edges[1::2].tolist()
+
+    parent = []
+    boxes = []
+
+    def find(label):
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    previous, current = [], []
+    current_row = -2
+    for y, start, end in zip(run_rows, starts, ends):
+        if y != current_row:
+            previous = current if y == current_row + 1 else []
+            current, current_row = [], y
+
+        label = None
+        for p_start, p_end, p_label in previous:
+            if p_start > end:
+                break
+            if start <= p_end:
+                root = find(p_label)
+                if label is None:
+                    label = root
+                elif root != label:
+                    parent[root] = label
+                    box, other = boxes[label], boxes[root]
+                    boxes[label] = [min(box[0], other[0]), max(box[1], other[1]),
+                                    min(box[2], other[2]), max(box[3], other[3])]
+        if label is None:
+            label = len(parent)
+            parent.append(label)
+            boxes.append([y, y + 1, start, end])
+        else:
+            box = boxes[label]
+            boxes[label] = [box[0], y + 1, min(start, box[2]), max(end, box[3])]
+        current.append((start, end, label))
+
+    return [tuple(boxes[label]) for label in range(len(parent)) if parent[label] == label]
+
+
+def segment(image, min_pixels=2):
+    """Per-character boxes, left to right; dots and accents join the glyph below them"""
+    mask = binarize(image)
+    components = [
+        box for box in connected_components(mask)
+        if (box[1] - box[0]) * (box[3] - box[2]) >= min_pixels
+    ]
+    glyphs = []
+    for top, bottom, left, right in sorted(components, key=lambda box: box[2]):
+        if glyphs and left < glyphs[-1][3] - 1:
+            g_top, g_bottom, g_left, g_right = glyphs[-1]
+            glyphs[-1] = (min(top, g_top), max(bottom, g_bottom), g_left, max(right, g_right))
+        else:
+            glyphs.append((top, bottom, left, right))
+    return mask, glyphs
+
+
+def glyph_vector(mask, box):
+    """A glyph resampled onto GLYPH_SHAPE, flattened, plus its aspect ratio"""
+    top, bottom, left, right = box
+    crop = mask[top:bottom, left:right]
+    rows = ((np.arange(GLYPH_SHAPE[0]) + 0.5) * crop.shape[0] / GLYPH_SHAPE[0]).astype(int)
+    columns = ((np.arange(GLYPH_SHAPE[1]) + 0.5) * crop.shape[1] / GLYPH_SHAPE[1]).astype(int)
+    return crop[rows][:, columns].ravel().astype(np.float32), crop.shape[1] / crop.shape[0]
+
+
+class DigitReader:
+    """Reads the number in the "Showing N results" region by glyph template matching
+
+    Templates are learned from frames whose text is already known, normally
+    an OCR read of the same frame, and cached in glyphs.npz beside
+    config.json. read() returns the value with a confidence in [0, 1];
+    callers fall back to full OCR below `min_confidence`.
+    """
+
+    def __init__(self, path=GLYPHS_FILE, min_confidence=0.9, per_char=8):
+        self.path = path
+        self.min_confidence = min_confidence
+        # Variants kept per character, e.g. for anti-aliasing at different x offsets
+        self.per_char = per_char
+        self.labels = []
+        self.vectors = np.zeros((0, GLYPH_SHAPE[0] * GLYPH_SHAPE[1]), dtype=np.float32)
+        self.aspects = np.zeros(0, dtype=np.float32)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=GLYPHS_FILE, **kwargs):
+        reader = cls(path, **kwargs)
+        try:
+            with np.load(path) as data:
+                reader.labels = [str(label) for label in data['labels']]
+                reader.vectors = data['vectors'].astype(np.float32)
+                reader.aspects = data['aspects'].astype(np.float32)
+        except FileNotFoundError:
+            pass
+        return reader
+
+    def save(self, path=None):
+        """Write the templates atomically; every lane may save its own reader at the same time"""
+        path = path or self.path
+        # One temp file per writer, so concurrent saves never interleave
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            with open(temp_path, 'wb') as f:
+                np.savez_compressed(f, labels=np.array(self.labels),
+                                    vectors=self.vectors, aspects=self.aspects)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def learn(self, image, text):
+        """Add templates from a frame whose text is known; False if glyphs and text do not line up"""
+        characters = [char for char in text if not char.isspace()]
+        mask, boxes = segment(image)
+        if not characters or len(boxes) != len(characters):
+            return False
+
+        with self._lock:
+            for char, box in zip(characters, boxes):
+                vector, aspect = glyph_vector(mask, box)
+                known = [i for i, label in enumerate(self.labels) if label == char]
+                if known:
+                    if len(known) >= self.per_char:
+                        continue
+                    scores = 1.0 - np.abs(self.vectors[known] - vector).mean(axis=1)
+                    if scores.max() > 0.98:
+                        continue
+                self.labels.append(char)
+                self.vectors = np.vstack([self.vectors, vector[None]])
+                self.aspects = np.append(self.aspects, np.float32(aspect))
+        return True
+
+    def build(self, frames, ocr):
+        """Learn templates from recorded results frames, reading each once with full OCR"""
+        learned = 0
+        for frame in frames:
+            text = ' '.join(ocr.readtext(frame, detail=0, paragraph=False))
+            learned += self.learn(frame, text)
+        return learned
+
+    def read(self, image):
+        """(number, confidence) for the first run of digits in `image`; (None, 0.0) if there is none"""
+        if not self.labels:
+            return None, 0.0
+        mask, boxes = segment(image)
+        if not boxes:
+            return None, 0.0
+
+        glyphs = [glyph_vector(mask, box) for box in boxes]
+        vectors = np.stack([vector for vector, _ in glyphs])
+        aspects = np.array([aspect for _, aspect in glyphs], dtype=np.float32)
+        # Every glyph against every template in one pass
+        scores = 1.0 - np.abs(vectors[:, None, :] - self.vectors[None, :, :]).mean(axis=2)
+        # Same shape at a different width, e.g. '1' against 'l', should not match
+        scores -= 0.5 * np.abs(np.log(self.aspects[None, :] / aspects[:, None]))
+
+        labels = np.array(self.labels)
+        digits = []
+        confidence = 1.0
+        for row in scores:
+            best = int(np.argmax(row))
+            label = self.labels[best]
+            if not label.isdigit():
+                if digits:
+                    break
+                continue
+            # A close runner-up with another label makes the match doubtful
+            others = row[labels != label]
+            margin = row[best] - others.max() if others.size else 1.0
+            confidence = min(confidence, float(row[best]), 0.5 + float(margin) * 5)
+            digits.append(label)
+
+        if not digits:
+            return None, 0.0
+        return int(''.join(digits)), max(0.0, confidence)
@@ -0,0 +1,184 @@
+import queue
+import random
+import threading
+import time
+from collections import deque
+from Emperor.utils.handoff import NameStream
+
+
+class TokenBucket:
+    """Allows `rate_per_minute` events on average, with bursts of up to `burst`"""
+
+    def __init__(self, rate_per_minute, burst=1):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, stop=None):
+        """Block until a token is free; returns False if `stop` was set while waiting"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if stop is not None:
+                if stop.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+
+
+class KeyboardSender:
+    """Opens chat and types the whole command in one pyautogui call"""
+
+    def send(self, command):
+        import pyautogui
+        pyautogui.press('enter')
+        # No per-character sleeps; typewrite cannot type accented names, use ClipboardSender for those
+        pyautogui.write(command, interval=0)
+        pyautogui.press('enter')
+
+
+class ClipboardSender:
+    """Opens chat and pastes the command, which also works for accented names"""
+
+    def __init__(self):
+        import pyperclip
+        self._pyperclip = pyperclip
+
+    def send(self, command):
+        import pyautogui
+        self._pyperclip.copy(command)
+        pyautogui.press('enter')
+        pyautogui.hotkey('ctrl', 'v')
+        pyautogui.press('enter')
+
+
+def default_sender(paste=True):
+    """Clipboard paste when pyperclip is installed and wanted, typing otherwise"""
+    if paste:
+        try:
+            return ClipboardSender()
+        except ImportError:
+            pass
+    return KeyboardSender()
+
+
+class InviteDispatcher:
+    """Sends /ginvite commands from its own thread at a token-bucket controlled rate"""
+
+    def __init__(self, sender=None, rate_per_minute=40, ceiling_per_minute=60, jitter=0.25,
+                 burst=1, on_sent=None, on_error=None, can_send=None, max_pending=0, spill_path=None):
+        self.sender = sender or default_sender()
+        self.rate_per_minute = min(rate_per_minute, ceiling_per_minute)
+        # Fraction of the mean gap added at random so invites are not perfectly regular
+        self.jitter = jitter
+        self.bucket = TokenBucket(self.rate_per_minute, burst)
+        self.on_sent = on_sent
+        self.on_error = on_error
+        # Checked before each send, e.g. whether the game still has focus; the name waits until it passes
+        self.can_send = can_send
+
+        self.sent = 0
+        self.failed = 0
+        self.started_at = None
+
+        # Bounded when max_pending is set, so submit() pushes back on a scanner that runs ahead
+        self._queue = NameStream(max_pending, spill_path)
+        self._recent = deque()
+        self._stop = threading.Event()
+        self._resume = threading.Event()
+        self._resume.set()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self.started_at = time.monotonic()
+            self._thread = threading.Thread(target=self._run, name="invite-dispatcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, name, timeout=None):
+        """Queue a name; False if the queue stayed full for `timeout` seconds"""
+        try:
+            self._queue.put(name, timeout=timeout)
+        except queue.Full:
+            return False
+        return True
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def outstanding(self):
+        """Names submitted but not handled yet, including the one being sent"""
+        return self._queue.unfinished_tasks
+
+    def pause(self):
+        self._resume.clear()
+
+    def resume(self):
+        self._resume.set()
+
+    def join(self):
+        """Wait until every submitted name has been handled"""
+        self._queue.join()
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self._resume.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._queue.close()
+
+    def _run(self):
+        mean_gap = 60.0 / self.rate_per_minute
+        while not self._stop.is_set():
+            try:
+                name = self._queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            try:
+                self._resume.wait()
+                if self._stop.is_set() or not self.bucket.acquire(self._stop):
+                    continue
+                if self.jitter and self._stop.wait(random.uniform(0, self.jitter * mean_gap)):
+                    continue
+                # Hold on to the name until sending is allowed again, e.g. the game is back in front
+                while self.can_send and not self.can_send():
+                    if self._stop.wait(0.1):
+                        break
+                if self._stop.is_set():
+                    continue
+
+                self.sender.send(f"/ginvite {name}")
+                self.sent += 1
+                self._recent.append(time.monotonic())
+                if self.on_sent:
+                    self.on_sent(name)
+            except Exception as e:
+                self.failed += 1
+                if self.on_error:
+                    self.on_error(name, e)
+            finally:
+                self._queue.task_done()
+
+    def throughput(self, window=60.0):
+        """Measured invites per minute over the last `window` seconds"""
+        now = time.monotonic()
+        while self._recent and now - self._recent[0] > window:
+            self._recent.popleft()
+        if not self._recent or self.started_at is None:
+            return 0.0
+        span = min(window, now - self.started_at)
+        return len(self._recent) * 60.0 / span if span > 0 else 0.0
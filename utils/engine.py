@@ -0,0 +1,360 @@
+import threading
+import time
+
+
+IDLE = 'idle'
+SCANNING = 'scanning'
+INVITING = 'inviting'
+PAUSED = 'paused'
+
+MAX_LEVEL = 80
+
+
+class EngineStopped(Exception):
+    """Raised at the next checkpoint once the engine has been told to stop"""
+
+
+def fixed_ranges(width, start=1, top=MAX_LEVEL):
+    """Level ranges of `width` levels from `start` up to `top`: 1-10, 11-20, ..."""
+    width = max(1, int(width))
+    low = start
+    while low <= top:
+        yield (low, min(low + width - 1, top))
+        low += width
+
+
+class RecruitmentEngine:
+    """Scans /who ranges and invites the results on a worker thread
+
+    The thread moves between scanning and inviting and calls checkpoint()
+    between steps (and the scanner between pages), which is where pause and
+    stop take effect. Log lines and stats are buffered and handed to
+    `on_batch(logs, stats)` once per step, never per event.
+
+    With `stream` on, the scanner hands over each page's new names as soon
+    as they are read and they go straight to the dispatcher, so the first
+    invite of a range goes out about one page in rather than after the whole
+    scan. A dispatcher with a bounded queue makes the scan wait when the
+    invites fall behind.
+    """
+
+    def __init__(self, scan, dispatcher, ranges, filter_names=None, retry_queue=None,
+                 on_batch=None, on_state=None, poll_interval=0.1, session=None, focus=None, stream=True,
+                 activate=None, verifier=None):
+        # scan(level_range, checkpoint, pages=None, on_page=None, on_names=None) -> names found in that range
+        self.scan = scan
+        self.dispatcher = dispatcher
+        # Any iterable of (low, high) ranges; a SweepScheduler also gets each range's yield back
+        self.ranges = ranges
+        # e.g. CooldownIndex.filter_eligible, to drop recently invited names
+        self.filter_names = filter_names
+        self.retry_queue = retry_queue
+        # InviteVerifier feeding retry_queue; the last replies are waited for before finishing
+        self.verifier = verifier
+        self.on_batch = on_batch
+        self.on_state = on_state
+        self.poll_interval = poll_interval
+        # SessionCheckpoint journaling each step, so a restart picks up where this left off
+        self.session = session
+        # FocusMonitor; checkpoints pause the engine the moment the game loses focus,
+        # and a pause for focus ends by itself once the game is in front again
+        self.focus = focus
+        # Brings the game window to the front; called on start and resume, which are
+        # clicked in the GUI and so always begin with the game out of focus
+        self.activate = activate
+        self._focus_paused = False
+        self.stream = stream
+        if session is not None and retry_queue is not None:
+            retry_queue.on_schedule = session.retry
+
+        self.state = IDLE
+        self.current_range = None
+        # Whether current_range has been reported to self.ranges yet
+        self._reported = False
+        self.stats = {'current_range': '--', 'processed': 0}
+        # Seconds from the start of each range to its first invite
+        self.first_invites = []
+
+        # Names of the current range handed to the dispatcher, and those sent so far
+        self._submitted = []
+        self._sent = set()
+        self._range_started = None
+
+        self._logs = []
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._resume = threading.Event()
+        self._resume.set()
+        self._thread = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if not self.is_running:
+            self._stop.clear()
+            self._resume.set()
+            self._thread = threading.Thread(target=self._run, name="recruitment-engine", daemon=True)
+            self._thread.start()
+        return self
+
+    def pause(self):
+        self._focus_paused = False
+        self._resume.clear()
+        self.dispatcher.pause()
+
+    def focus_lost(self):
+        """Pause until the game has focus again; unlike pause(), this resumes by itself"""
+        self._resume.clear()
+        self.dispatcher.pause()
+        self._focus_paused = True
+
+    def resume(self):
+        self._activate()
+        self._unpause()
+
+    def _unpause(self):
+        self._focus_paused = False
+        self._resume.set()
+        self.dispatcher.resume()
+
+    def _activate(self):
+        if self.activate is None:
+            return
+        try:
+            self.activate()
+        except Exception as e:
+            self.log(f"Could not bring the game window to the front: {str(e)}", "yellow")
+
+    def _wait_for_focus(self, timeout=1.0):
+        """Give a just-activated game window a moment to report focus"""
+        deadline = time.monotonic() + timeout
+        while (self.focus is not None and not self.focus.is_focused and not self._stop.is_set()
+               and time.monotonic() < deadline):
+            time.sleep(min(self.poll_interval, 0.05))
+
+    def stop(self, timeout=None):
+        """Ask the worker to stop at its next checkpoint; waits for it when `timeout` is given"""
+        self._stop.set()
+        self._resume.set()
+        if timeout is not None and self._thread is not None:
+            self._thread.join(timeout)
+
+    def checkpoint(self):
+        """Block while paused and raise EngineStopped once stopped; safe from any worker thread"""
+        if self.focus is not None and not self.focus.is_focused and self._resume.is_set():
+            self.log("Game window lost focus - Paused", "yellow")
+            self.focus_lost()
+        if not self._resume.is_set():
+            previous = self.state
+            self._set_state(PAUSED)
+            while not self._resume.wait(self.poll_interval):
+                if self._focus_paused and self.focus is not None and self.focus.is_focused:
+                    self.log("Game window focused again - Resumed", "green")
+                    self._unpause()
+            if not self._stop.is_set():
+                self._wait_for_focus()
+                self._set_state(previous)
+        if self._stop.is_set():
+            raise EngineStopped()
+
+    def log(self, message, color="black"):
+        with self._lock:
+            self._logs.append((message, color))
+
+    def invited(self, name):
+        """Called by the dispatcher's on_sent for every invite that went out"""
+        self.count('processed')
+        with self._lock:
+            if not self._sent and self._range_started is not None:
+                self.first_invites.append(time.monotonic() - self._range_started)
+            self._sent.add(name)
+        if self.session:
+            self.session.sent(name)
+
+    def count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + amount
+            self._dirty = True
+
+    def flush(self):
+        """Hand buffered log lines and the latest stats to on_batch in one call"""
+        with self._lock:
+            if not self._logs and not self._dirty:
+                return
+            logs, self._logs = self._logs, []
+            stats = dict(self.stats)
+            self._dirty = False
+        if self.on_batch:
+            self.on_batch(logs, stats)
+
+    def _set_state(self, state):
+        if state == self.state:
+            return
+        self.state = state
+        with self._lock:
+            self.stats['status'] = state.title()
+            self._dirty = True
+        self.flush()
+        if self.on_state:
+            self.on_state(state)
+
+    def _run(self):
+        self.dispatcher.start()
+        self._activate()
+        self._wait_for_focus()
+        try:
+            resume = self.session.resume_range() if self.session else None
+            if resume:
+                level_range, scanned, pages, queue = resume
+                self.log(f"Resuming range {level_range[0]}-{level_range[1]}: "
+                         f"{len(pages)} page(s) read, {len(queue)} name(s) left to invite")
+                self._work(level_range, pages=pages, queue=queue if scanned else None)
+            for level_range in self._ranges():
+                self._work(level_range)
+            self._finish_retries()
+            if self.session:
+                self.session.done()
+            self.log("All ranges done", "green")
+        except EngineStopped:
+            self.log("Recruitment engine stopped", "yellow")
+        except Exception as e:
+            self.log(f"Recruitment engine error: {str(e)}", "red")
+        finally:
+            # A range we were handed but never reported goes back for another lane
+            release = getattr(self.ranges, 'release', None)
+            if release is not None and self.current_range is not None and not self._reported:
+                release(self.current_range)
+            self.dispatcher.stop()
+            self._set_state(IDLE)
+            self.flush()
+
+    def _ranges(self):
+        """The ranges to work through; waiting for a shared range ends as soon as we are stopped"""
+        lease = getattr(self.ranges, 'lease', None)
+        if lease is None:
+            yield from self.ranges
+            return
+        while True:
+            level_range = lease(stop=self._stop)
+            if level_range is None:
+                # Stopped while waiting rather than out of ranges
+                self.checkpoint()
+                return
+            yield level_range
+
+    def _work(self, level_range, pages=None, queue=None):
+        """Scan one range (unless `queue` is already known) and invite its names"""
+        self.checkpoint()
+        self.current_range = level_range
+        self._reported = False
+        with self._lock:
+            self.stats['current_range'] = f"{level_range[0]}-{level_range[1]}"
+            self._dirty = True
+            self._submitted = []
+            self._sent = set()
+            self._range_started = time.monotonic()
+
+        if queue is None:
+            if self.session and pages is None:
+                self.session.begin_range(level_range)
+            self._set_state(SCANNING)
+            names = self._scan(level_range, pages)
+        else:
+            names = queue
+
+        # A streamed scan has already filtered and submitted its names
+        streamed = self.stream and queue is None
+        if streamed:
+            eligible = list(self._submitted)
+        elif self.filter_names:
+            eligible = self.filter_names(names)
+        else:
+            eligible = names
+        if self.filter_names:
+            self.log(f"Range {level_range[0]}-{level_range[1]}: {len(names)} names, "
+                     f"{len(names) - len(eligible)} in cooldown")
+        else:
+            self.log(f"Range {level_range[0]}-{level_range[1]}: {len(names)} names")
+        if queue is None:
+            self._report(level_range, len(names), len(eligible))
+            if self.session:
+                with self._lock:
+                    unsent = [name for name in eligible if name not in self._sent]
+                self.session.scanned(unsent)
+        self.flush()
+
+        self._set_state(INVITING)
+        if not streamed:
+            for name in eligible:
+                self._submit(name)
+        self._drain()
+
+    def _scan(self, level_range, pages=None):
+        kwargs = {}
+        if self.stream:
+            kwargs['on_names'] = self._found
+        if self.session is not None:
+            kwargs.update(pages=pages, on_page=self.session.page)
+        return self.scan(level_range, self.checkpoint, **kwargs)
+
+    def _found(self, names):
+        """Invite a page's new names while the scan goes on; runs on the scanner's thread"""
+        eligible = self.filter_names(names) if self.filter_names else list(names)
+        for name in eligible:
+            self._submit(name)
+        with self._lock:
+            self._submitted.extend(eligible)
+
+    def _submit(self, name):
+        """Hand a name to the dispatcher, waiting while its queue is full"""
+        while not self.dispatcher.submit(name, timeout=self.poll_interval):
+            # Backpressure: stay responsive to pause and stop while the invites catch up
+            self.checkpoint()
+            self.flush()
+
+    def _report(self, level_range, total, new):
+        report = getattr(self.ranges, 'report', None)
+        if report is None:
+            return
+        report(level_range, total, new)
+        self._reported = True
+        if self.session and hasattr(self.ranges, 'snapshot'):
+            self.session.sweep(self.ranges.snapshot())
+        upcoming = self.ranges.peek()
+        with self._lock:
+            self.stats['next_range'] = f"{upcoming[0]}-{upcoming[1]}" if upcoming else '--'
+            self._dirty = True
+
+    def _drain(self, retries=False):
+        """Wait for the dispatcher to empty, resubmitting retries that come due
+
+        With `retries`, also wait for the verifier to check every invite and
+        for every scheduled retry to be sent, so none are left behind.
+        """
+        while True:
+            self.checkpoint()
+            if self.retry_queue is not None:
+                for name in self.retry_queue.due():
+                    self.log(f"Retrying invite to {name}")
+                    self._submit(name)
+            if not self.dispatcher.outstanding() and not (retries and self._retries_pending()):
+                return
+            self.flush()
+            time.sleep(self.poll_interval)
+
+    def _retries_pending(self):
+        if self.verifier is not None and self.verifier.pending():
+            return True
+        return self.retry_queue is not None and len(self.retry_queue) > 0
+
+    def _finish_retries(self):
+        """After the last range, keep going until the retries are through"""
+        if not self._retries_pending():
+            return
+        self._set_state(INVITING)
+        if self.retry_queue is not None and len(self.retry_queue):
+            self.log(f"Waiting for {len(self.retry_queue)} retried invite(s) before finishing")
+        self._drain(retries=True)
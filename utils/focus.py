@@ -0,0 +1,172 @@
+import sys
+import threading
+from Emperor.utils.regions import GAME_TITLE
+
+
+class FakeBackend:
+    """Focus driven by hand, for tests and replays without a game client"""
+
+    def __init__(self, focused=True):
+        self.focused = focused
+        self._callback = None
+
+    def start(self, callback):
+        self._callback = callback
+        callback(self.focused)
+
+    def set_focused(self, focused):
+        self.focused = focused
+        if self._callback:
+            self._callback(focused)
+
+    def stop(self):
+        self._callback = None
+
+
+class PollingBackend:
+    """Asks the WindowLocator, polling fast right after a change and backing off while stable"""
+
+    def __init__(self, locator, fast=0.02, slow=0.1):
+        self.locator = locator
+        self.fast = fast
+        self.slow = slow
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, callback):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(callback,), name="focus-poll", daemon=True)
+        self._thread.start()
+
+    def _run(self, callback):
+        focused = None
+        interval = self.fast
+        while not self._stop.is_set():
+            try:
+                current = self.locator.is_focused()
+            except Exception:
+                current = False
+            if current != focused:
+                focused = current
+                callback(current)
+                interval = self.fast
+            else:
+                interval = min(interval * 2, self.slow)
+            self._stop.wait(interval)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
+class WinEventBackend:
+    """Windows foreground-change hook; the callback runs as soon as focus moves"""
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WM_QUIT = 0x0012
+
+    def __init__(self, title=GAME_TITLE):
+        import ctypes
+        from ctypes import wintypes
+        self._ctypes = ctypes
+        self._wintypes = wintypes
+        self.user32 = ctypes.windll.user32
+        self.kernel32 = ctypes.windll.kernel32
+        self.title = title
+        self._thread = None
+        self._thread_id = None
+        self._ready = threading.Event()
+
+    def _is_game(self, hwnd):
+        if not hwnd:
+            return False
+        buffer = self._ctypes.create_unicode_buffer(512)
+        self.user32.GetWindowTextW(hwnd, buffer, 512)
+        return self.title in buffer.value
+
+    def start(self, callback):
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, args=(callback,), name="focus-hook", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=1.0)
+
+    def _run(self, callback):
+        ctypes, wintypes = self._ctypes, self._wintypes
+        procedure_type = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+
+        def on_event(hook, event, hwnd, id_object, id_child, thread, time):
+            callback(self._is_game(hwnd))
+
+        # Keep a reference, or the callback is garbage collected under the hook
+        self._procedure = procedure_type(on_event)
+        hook = self.user32.SetWinEventHook(
+            self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_FOREGROUND,
+            0, self._procedure, 0, 0, self.WINEVENT_OUTOFCONTEXT
+        )
+        self._thread_id = self.kernel32.GetCurrentThreadId()
+        callback(self._is_game(self.user32.GetForegroundWindow()))
+        self._ready.set()
+
+        # The hook is delivered through this thread's message loop
+        message = wintypes.MSG()
+        while self.user32.GetMessageW(ctypes.byref(message), 0, 0, 0) > 0:
+            self.user32.TranslateMessage(ctypes.byref(message))
+            self.user32.DispatchMessageW(ctypes.byref(message))
+        self.user32.UnhookWinEvent(hook)
+
+    def stop(self):
+        if self._thread is not None and self._thread_id is not None:
+            self.user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+
+def default_backend(locator):
+    """The foreground hook on Windows, adaptive polling elsewhere or if the hook is unavailable"""
+    if sys.platform == 'win32':
+        try:
+            return WinEventBackend(locator.title)
+        except (ImportError, AttributeError, OSError):
+            pass
+    return PollingBackend(locator)
+
+
+class FocusMonitor:
+    """Tracks whether the game has focus; `is_focused` is a plain attribute, cheap to read anywhere
+
+    Listeners are called from the backend's thread on every change, so they
+    can pause work directly instead of waiting for the Qt event loop.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.is_focused = False
+        self.changes = 0
+        self._listeners = []
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def start(self):
+        self.backend.start(self._update)
+        return self
+
+    def stop(self):
+        self.backend.stop()
+
+    def _update(self, focused):
+        if focused == self.is_focused and self.changes:
+            return
+        self.is_focused = focused
+        self.changes += 1
+        for listener in self._listeners:
+            try:
+                listener(focused)
+            except Exception as e:
+                print(f"Focus listener error: {str(e)}")
@@ -0,0 +1,107 @@
+import threading
+import numpy as np
+
+
+class PILSource:
+    """Screen grabs through PIL.ImageGrab"""
+
+    def grab(self, bbox):
+        from PIL import ImageGrab
+        return np.asarray(ImageGrab.grab(bbox=bbox))
+
+
+class MSSSource:
+    """Screen grabs through mss, which skips PIL's image conversion"""
+
+    def __init__(self):
+        import mss
+        self._mss = mss
+        # mss handles are per-thread, so each grabbing thread gets its own
+        self._local = threading.local()
+
+    def grab(self, bbox):
+        if not hasattr(self._local, 'sct'):
+            self._local.sct = self._mss.mss()
+        left, top, right, bottom = bbox
+        shot = self._local.sct.grab({'left': left, 'top': top, 'width': right - left, 'height': bottom - top})
+        # BGRA bytes; reversing the first three channels gives an RGB view
+        return np.frombuffer(shot.raw, np.uint8).reshape(shot.height, shot.width, 4)[..., 2::-1]
+
+
+def default_source():
+    """mss when it is installed, PIL otherwise"""
+    try:
+        return MSSSource()
+    except ImportError:
+        return PILSource()
+
+
+def union_bounds(boxes):
+    boxes = list(boxes)
+    return (
+        min(box[0] for box in boxes),
+        min(box[1] for box in boxes),
+        max(box[2] for box in boxes),
+        max(box[3] for box in boxes)
+    )
+
+
+class FrameGrabber:
+    """Grabs the part of the screen covering the requested regions and hands out numpy views
+
+    Each set of regions asked for together is captured as one rectangle,
+    their union, computed once per set. Views point into a buffer that the
+    next grab of that set overwrites, so anything kept past the current tick
+    (queues, recorders) must copy it.
+    """
+
+    def __init__(self, regions, source=None, bounds=None):
+        self.source = source or default_source()
+        self.fixed_bounds = bounds
+        self.frame_id = 0
+        self._buffers = {}
+        self._lock = threading.RLock()
+        self.set_regions(regions)
+
+    def set_regions(self, regions):
+        """Swap in new absolute regions, e.g. after the game window moved"""
+        with self._lock:
+            self.regions = dict(regions)
+            self.bounds = self.fixed_bounds or union_bounds(self.regions.values())
+            self._bounds_for = {}
+            self._buffers = {}
+
+    def bounds_for(self, region_names):
+        """Capture rectangle for a set of regions, cached until the regions change"""
+        key = frozenset(region_names)
+        bounds = self._bounds_for.get(key)
+        if bounds is None:
+            bounds = self.fixed_bounds or union_bounds(self.regions[name] for name in key)
+            self._bounds_for[key] = bounds
+        return bounds
+
+    def tick(self, bounds=None):
+        """One screen capture of `bounds` (every region by default) into its reusable buffer"""
+        bounds = bounds or self.bounds
+        with self._lock:
+            raw = self.source.grab(bounds)
+            buffer = self._buffers.get(bounds)
+            if buffer is None or buffer.shape != raw.shape[:2] + (3,):
+                buffer = self._buffers[bounds] = np.empty(raw.shape[:2] + (3,), np.uint8)
+            np.copyto(buffer, raw[..., :3])
+            self.frame_id += 1
+            return buffer
+
+    def view(self, region_name, bounds=None):
+        """Zero-copy slice of the last capture of `bounds` for a region"""
+        bounds = bounds or self.bounds
+        left, top, right, bottom = self.regions[region_name]
+        origin_x, origin_y = bounds[0], bounds[1]
+        return self._buffers[bounds][top - origin_y:bottom - origin_y, left - origin_x:right - origin_x]
+
+    def grab(self, *region_names):
+        """Capture just the requested regions' bounds once and return a view of each from that frame"""
+        with self._lock:
+            bounds = self.bounds_for(region_names)
+            self.tick(bounds)
+            return {name: self.view(name, bounds) for name in region_names}
@@ -0,0 +1,184 @@
+import json
+import os
+import queue
+import time
+import uuid
+from collections import deque
+
+
+class NameStream(queue.Queue):
+    """Bounded FIFO of names between a scanner and the inviter
+
+    A full stream blocks put(), so a scanner that gets ahead of the inviter
+    waits for it instead of piling names up. With `spill_path` set, put()
+    never blocks: names past `maxsize` are appended to that NDJSON file and
+    read back in order once the in-memory part has drained.
+    """
+
+    def __init__(self, maxsize=0, spill_path=None):
+        self.capacity = maxsize
+        self.spill_path = spill_path
+        self.spilled = 0
+        # With a spill file the queue itself is unbounded and _put decides where names go
+        super().__init__(0 if spill_path else maxsize)
+
+    def _init(self, maxsize):
+        self.memory = deque()
+        self._spill = None
+        self._read_at = 0
+        self._unread = 0
+
+    def _qsize(self):
+        return len(self.memory) + self._unread
+
+    def _put(self, name):
+        # Once anything is on disk, later names queue behind it there
+        if self.spill_path and (self._unread or (self.capacity and len(self.memory) >= self.capacity)):
+            if self._spill is None:
+                self._spill = open(self.spill_path, 'w+b')
+            self._spill.seek(0, os.SEEK_END)
+            self._spill.write(json.dumps({'name': name}, ensure_ascii=False).encode('utf-8') + b'\n')
+            self._spill.flush()
+            self._unread += 1
+            self.spilled += 1
+        else:
+            self.memory.append(name)
+
+    def _get(self):
+        if self.memory:
+            return self.memory.popleft()
+        self._spill.seek(self._read_at)
+        line = self._spill.readline()
+        self._read_at = self._spill.tell()
+        self._unread -= 1
+        if not self._unread:
+            # Everything on disk has been handed out; start the file over
+            self._spill.seek(0)
+            self._spill.truncate()
+            self._read_at = 0
+        return json.loads(line)['name']
+
+    def close(self):
+        """Drop the spill file; names still in it are lost"""
+        with self.mutex:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+                os.remove(self.spill_path)
+            self._unread = 0
+
+
+class NameLog:
+    """Names appended to an NDJSON file the moment they are found, for an inviter in another process
+
+    Every run starts the file over with a header naming the run, so a
+    follower can tell this scan from whatever the file held before.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self.run = uuid.uuid4().hex
+        self._file = open(path, 'w', encoding='utf-8')
+        self._write({'run': self.run, 'started': time.time()})
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def add(self, name):
+        self._write({'name': name})
+        self.count += 1
+
+    def done(self):
+        """Mark the scan finished so followers stop waiting for more"""
+        self._write({'done': True})
+        self._file.close()
+
+
+def _open_run(path):
+    """A NameLog file opened past its header, and the header; (None, None) until there is one"""
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None, None
+    header = f.readline()
+    if not header.endswith(b'\n'):
+        f.close()
+        return None, None
+    return f, header
+
+
+def _finished(f):
+    """Whether the run in `f` is already marked done; leaves the position where it was"""
+    position = f.tell()
+    finished = any(line.endswith(b'\n') and json.loads(line).get('done') for line in f)
+    f.seek(position)
+    return finished
+
+
+def _replaced(f, path, header):
+    """Whether `path` no longer holds the run being read from `f`"""
+    try:
+        current = os.stat(path)
+    except FileNotFoundError:
+        # Being written again; the new file will show up with its own header
+        return False
+    if current.st_ino != os.fstat(f.fileno()).st_ino or current.st_size < f.tell():
+        return True
+    position = f.tell()
+    f.seek(0)
+    first = f.readline()
+    f.seek(position)
+    return first != header
+
+
+def _follow_run(f, path, header, poll, stop):
+    """Yield one run's names; returns True once it is done, False if the file was started over"""
+    partial = b''
+    while stop is None or not stop.is_set():
+        line = f.readline()
+        if not line:
+            if _replaced(f, path, header):
+                return False
+            time.sleep(poll)
+            continue
+        partial += line
+        if not partial.endswith(b'\n'):
+            continue
+        entry = json.loads(partial)
+        partial = b''
+        if entry.get('done'):
+            return True
+        if 'name' in entry:
+            yield entry['name']
+    return True
+
+
+def follow_names(path, poll=0.2, stop=None):
+    """Yield names from the NameLog run being written to `path`, until it is marked done
+
+    A run that is already done when this starts is left over from an
+    earlier scan; it is skipped and the next run written there is followed.
+    If the file is started over mid-run (it shrinks, is replaced or gets a
+    new header), following moves to the new run. A half-written last line is
+    held back until the rest of it arrives. `stop` is an optional
+    threading.Event.
+    """
+    check_stale = os.path.exists(path)
+    stale = None
+    while stop is None or not stop.is_set():
+        f, header = _open_run(path)
+        if f is None or header == stale:
+            if f is not None:
+                f.close()
+            time.sleep(poll)
+            continue
+        with f:
+            if check_stale:
+                check_stale = False
+                if _finished(f):
+                    stale = header
+                    continue
+            if (yield from _follow_run(f, path, header, poll, stop)):
+                return
@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+import unicodedata
+from collections import defaultdict
+from datetime import datetime
+from Emperor.utils.names import match_key
+
+
+def normalize_name(name):
+    """Index key for a player name: the key its OCR variants share, so 'TOßÁ' and 'TOBA' are one player
+
+    Names with nothing left after the ASCII fold fall back to NFKC and case folding.
+    """
+    return match_key(name) or unicodedata.normalize('NFKC', name).strip().casefold()
+
+
+def today():
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+class InviteLedger:
+    """Invite history as a dnd.json snapshot plus an append-only journal
+
+    The snapshot keeps the existing {date: [names]} layout. Every invite is one
+    small line appended to <snapshot>.journal, and compact() folds the journal
+    back into the snapshot. On load, a torn last journal line from a crash is
+    dropped, and names already in the snapshot are skipped.
+    """
+
+    def __init__(self, path, compact_every=500, sync=True):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.compact_every = compact_every
+        self.sync = sync
+
+        self.dates = defaultdict(list)       # date -> names in invite order
+        self.index = defaultdict(set)        # date -> normalized names
+        self.last_invited = {}               # normalized name -> latest date
+        self.pending = 0                     # journal entries since the last compaction
+
+        self._journal = None
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            snapshot = {}
+
+        for date in sorted(snapshot):
+            for name in snapshot[date]:
+                self._add(name, date)
+
+        valid_bytes = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    valid_bytes += len(line)
+                    self._add(entry['name'], entry['date'])
+                    self.pending += 1
+            # Cut off a half-written entry so new appends start on a clean line
+            if valid_bytes != os.path.getsize(self.journal_path):
+                with open(self.journal_path, 'r+b') as f:
+                    f.truncate(valid_bytes)
+
+    def _add(self, name, date):
+        key = normalize_name(name)
+        if key in self.index[date]:
+            return False
+        self.index[date].add(key)
+        self.dates[date].append(name)
+        if date > self.last_invited.get(key, ''):
+            self.last_invited[key] = date
+        return True
+
+    def contains(self, name, date=None):
+        """Whether `name` was invited on `date` (today by default)"""
+        return normalize_name(name) in self.index.get(date or today(), ())
+
+    def __contains__(self, name):
+        return self.contains(name)
+
+    def record(self, name, date=None):
+        """Append one invite to the journal; returns False if it was already recorded"""
+        date = date or today()
+        with self._lock:
+            if not self._add(name, date):
+                return False
+            if self._journal is None:
+                self._journal = open(self.journal_path, 'a', encoding='utf-8')
+            self._journal.write(json.dumps({'date': date, 'name': name}, ensure_ascii=False) + '\n')
+            self._journal.flush()
+            if self.sync:
+                os.fsync(self._journal.fileno())
+            self.pending += 1
+
+            if self.compact_every and self.pending >= self.compact_every:
+                self._compact()
+        return True
+
+    def compact(self):
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the snapshot atomically, then start an empty journal"""
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(self.dates), f, ensure_ascii=False, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+        # A crash before this point only leaves duplicates, which load() skips
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        open(self.journal_path, 'w').close()
+        self.pending = 0
+
+    def close(self):
+        with self._lock:
+            if self.pending:
+                self._compact()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
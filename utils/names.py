@@ -0,0 +1,154 @@
+import unicodedata
+from functools import lru_cache
+
+
+# Glyphs the OCR returns for plain capitals in the game font
+CONFUSABLES = str.maketrans({'ß': 'B', 'Æ': 'AE', 'Ø': 'O'})
+
+
+@lru_cache(maxsize=65536)
+def ascii_key(name):
+    """NFKD/ASCII fold used for sorting, computed once per distinct name"""
+    return unicodedata.normalize('NFKD', name).encode('ASCII', 'ignore').decode()
+
+
+@lru_cache(maxsize=65536)
+def match_key(name):
+    """Key under which OCR variants of the same player collide: 'TOßÁ' -> 'TOBA'"""
+    # Before upper(), which would turn 'ß' into 'SS'
+    return ascii_key(name.strip().translate(CONFUSABLES).upper())
+
+
+def bounded_distance(a, b, limit):
+    """Levenshtein distance, or limit + 1 as soon as it is known to exceed `limit`"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+
+class NameCanonicalizer:
+    """Maps OCR variants of a name onto one canonical spelling
+
+    Only spellings with the same match_key are merged. Real players are
+    often a letter apart, so edit distance is never used against everything
+    seen so far; `close` only decides whether two captures of the same row,
+    in the overlap between consecutive pages, are one misread player.
+    """
+
+    def __init__(self, max_distance=1, min_length=5):
+        self.max_distance = max_distance
+        # Short names are too close to each other to fuzzy-match safely
+        self.min_length = min_length
+        self.canonical = {}
+
+    def canonicalize(self, name):
+        name = name.strip()
+        key = match_key(name)
+        if not key:
+            return name
+        return self.canonical.setdefault(key, name)
+
+    def close(self, a, b):
+        """Whether `a` and `b` could be one row read twice with a misread letter"""
+        a, b = match_key(a), match_key(b)
+        if a == b:
+            return True
+        if not self.max_distance or min(len(a), len(b)) < self.min_length:
+            return False
+        return bounded_distance(a, b, self.max_distance) <= self.max_distance
+
+    def same(self, a, b):
+        return self.canonicalize(a) == self.canonicalize(b)
+
+    def dedupe(self, names):
+        """Canonical names in first-seen order, each once"""
+        seen = set()
+        unique = []
+        for name in names:
+            canonical = self.canonicalize(name)
+            if canonical and canonical not in seen:
+                seen.add(canonical)
+                unique.append(canonical)
+        return unique
+
+
+def sort_names(names):
+    """Sort names while properly handling accented characters"""
+    return sorted(names, key=ascii_key)
+
+
+def align_overlap(previous, current, close=None):
+    """Rows at the top of `current` that repeat the bottom of `previous`
+
+    With `close`, overlapping rows may differ by a misread as long as at
+    least one of them matches exactly, so a page that merely starts with a
+    name one letter away from the last one is not taken for a repeat.
+    """
+    for overlap in range(min(len(previous), len(current)), 0, -1):
+        pairs = list(zip(previous[-overlap:], current[:overlap]))
+        if all(a == b for a, b in pairs):
+            return overlap
+        if close and any(a == b for a, b in pairs) and all(close(a, b) for a, b in pairs):
+            return overlap
+    return 0
+
+
+def merge_pages(pages, canonicalizer=None):
+    """Merge scroll captures by lining up each page with the tail of the one before"""
+    canonicalizer = canonicalizer or NameCanonicalizer()
+    merged = []
+    previous = []
+    for page in pages:
+        rows = [canonicalizer.canonicalize(name) for name in page if name.strip()]
+        merged.extend(rows[align_overlap(previous, rows, canonicalizer.close):])
+        previous = rows
+    # Anything repeated outside the overlap is still the same player
+    return canonicalizer.dedupe(merged)
+
+
+class ScrollMerger:
+    """Merges /who pages as they arrive and says when paging can stop"""
+
+    def __init__(self, canonicalizer=None, expected=None):
+        self.canonicalizer = canonicalizer or NameCanonicalizer()
+        # Player count read from the results region, if we trust it
+        self.expected = expected
+        self.names = []
+        self.pages = 0
+        self.exhausted = False
+        self._seen = set()
+        self._previous = []
+
+    def add_page(self, page):
+        """Merge one page in order and return the names it added"""
+        rows = [self.canonicalizer.canonicalize(name) for name in page if name.strip()]
+        overlap = align_overlap(self._previous, rows, self.canonicalizer.close)
+        added = []
+        for name in rows[overlap:]:
+            if name not in self._seen:
+                self._seen.add(name)
+                added.append(name)
+        self.names.extend(added)
+        self._previous = rows
+
+        # A scroll that shows nothing new means we are at the end of the list
+        if self.pages and not added:
+            self.exhausted = True
+        self.pages += 1
+        return added
+
+    @property
+    def done(self):
+        return self.exhausted or bool(self.expected and len(self.names) >= self.expected)
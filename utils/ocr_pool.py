@@ -0,0 +1,223 @@
+import importlib.util
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+
+DEFAULT_LANGUAGES = ['en', 'fr', 'es', 'de', 'pt']
+
+READER_MODES = ('full', 'cpu')
+
+# Reader owned by the current worker process, built once by _init_worker
+_reader = None
+
+
+def _init_worker(languages, gpu, quantize, threads):
+    """Load the EasyOCR model once when a worker process starts"""
+    global _reader
+    import easyocr
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+    _reader = easyocr.Reader(languages, gpu=gpu, quantize=quantize, verbose=False)
+
+
+def _ping():
+    """Report which worker answered, used to confirm every reader is loaded"""
+    return os.getpid()
+
+
+def _peak_memory():
+    """(pid, peak resident bytes) of this worker"""
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+        return os.getpid(), counters.PeakWorkingSetSize
+
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return os.getpid(), peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _readtext(image, kwargs):
+    return _reader.readtext(image, **kwargs)
+
+
+def _recognize(image, horizontal_list, kwargs):
+    return _reader.recognize(image, horizontal_list=horizontal_list, free_list=[], **kwargs)
+
+
+def language_chars(language):
+    """Characters EasyOCR decodes for `language`, or None if easyocr is not installed
+
+    Read straight from easyocr's character lists, so torch is not imported
+    into the calling process.
+    """
+    spec = importlib.util.find_spec('easyocr')
+    if spec is None or not spec.origin:
+        return None
+    path = Path(spec.origin).parent / 'character' / f'{language}_char.txt'
+    try:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            return set(f.read().splitlines())
+    except FileNotFoundError:
+        return None
+
+
+def minimal_languages(allowlist, candidates=DEFAULT_LANGUAGES, base='en'):
+    """Fewest of `candidates` whose characters cover `allowlist`, greedily, always with `base`
+
+    Characters no candidate has are ignored, since no reader could return
+    them. Falls back to all candidates when the character lists are missing.
+    """
+    chars = {language: language_chars(language) for language in [base, *candidates]}
+    if any(value is None for value in chars.values()):
+        return list(candidates)
+
+    wanted = {char for char in allowlist if not char.isspace()}
+    wanted &= set().union(*chars.values())
+    chosen = [base]
+    wanted -= chars[base]
+    while wanted:
+        best = max(candidates, key=lambda language: len(wanted & chars[language]))
+        chosen.append(best)
+        wanted -= chars[best]
+    return chosen
+
+
+def reader_options(mode='cpu', workers=1, allowlist='', threads=None):
+    """OCRPool keyword arguments for a reader mode
+
+    'full' is the reader as it was before modes existed: all five languages,
+    EasyOCR's default quantization (on when running on the CPU) and torch's
+    default of one thread per core in each worker; `threads` does not apply
+    to it. 'cpu' differs only in loading just the languages `allowlist`
+    needs and splitting the cores between the workers.
+    """
+    if mode == 'full':
+        return {'languages': DEFAULT_LANGUAGES, 'quantize': True, 'threads': 0}
+    if mode == 'cpu':
+        if threads is None:
+            threads = max(1, (os.cpu_count() or 1) // max(1, int(workers)))
+        return {'languages': minimal_languages(allowlist), 'quantize': True, 'threads': threads}
+    raise ValueError(f"Unknown reader mode: {mode}")
+
+
+class OCRPool:
+    """Long-lived pool of worker processes, each holding a warm EasyOCR reader
+
+    `quantize` is EasyOCR's dynamic int8 quantization, applied when running
+    on the CPU; EasyOCR turns it on by default. `threads` sets torch's intra-op threads per worker; 0 leaves
+    torch's default of one per core, which oversubscribes the CPU with more
+    than one worker.
+    """
+
+    def __init__(self, workers=1, cpu_only=True, languages=None, quantize=True, threads=0):
+        self.workers = max(1, int(workers))
+        self.cpu_only = cpu_only
+        self.languages = list(languages or DEFAULT_LANGUAGES)
+        self.quantize = quantize
+        self.threads = threads
+        self.startup_time = None
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    @property
+    def is_ready(self):
+        return self._ready.is_set()
+
+    def start(self):
+        """Spawn the workers and block until every reader has loaded its model"""
+        with self._lock:
+            if self._executor is not None:
+                return self.startup_time
+
+            started = time.perf_counter()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.languages, not self.cpu_only, self.quantize, self.threads)
+            )
+
+            # A worker only answers after its initializer ran, so keep pinging
+            # until every process has replied at least once
+            seen = set()
+            while len(seen) < self.workers:
+                pings = [self._executor.submit(_ping) for _ in range(self.workers)]
+                seen.update(ping.result() for ping in pings)
+
+            self.startup_time = time.perf_counter() - started
+            self._ready.set()
+            return self.startup_time
+
+    def start_async(self, on_ready=None, on_error=None):
+        """Warm the pool on a background thread so callers are not blocked"""
+        def run():
+            try:
+                startup_time = self.start()
+            except Exception as e:
+                if on_error:
+                    on_error(e)
+                return
+            if on_ready:
+                on_ready(startup_time)
+
+        thread = threading.Thread(target=run, name="ocr-pool-start", daemon=True)
+        thread.start()
+        return thread
+
+    def wait_ready(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    def submit(self, image, **kwargs):
+        """Queue a numpy frame for readtext and return a Future with the result"""
+        if self._executor is None:
+            self.start()
+        return self._executor.submit(_readtext, image, kwargs)
+
+    def readtext(self, image, **kwargs):
+        return self.submit(image, **kwargs).result()
+
+    def submit_recognize(self, image, horizontal_list, **kwargs):
+        """Recognition only on known [x_min, x_max, y_min, y_max] boxes, skipping detection"""
+        if self._executor is None:
+            self.start()
+        return self._executor.submit(_recognize, image, horizontal_list, kwargs)
+
+    def recognize(self, image, horizontal_list, **kwargs):
+        return self.submit_recognize(image, horizontal_list, **kwargs).result()
+
+    def peak_memory(self):
+        """Peak resident bytes of each worker, keyed by pid"""
+        if self._executor is None:
+            return {}
+        peaks = {}
+        while len(peaks) < self.workers:
+            reports = [self._executor.submit(_peak_memory) for _ in range(self.workers)]
+            peaks.update(report.result() for report in reports)
+        return peaks
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
+            self._ready.clear()
@@ -0,0 +1,545 @@
+import os
+import tempfile
+import threading
+import time
+from Emperor.utils.ledger import normalize_name
+from Emperor.utils.regions import DEFAULT_REGIONS, GAME_TITLE, RegionRegistry, WindowLocator, record_window
+from Emperor.utils.engine import IDLE, SCANNING, INVITING, PAUSED
+
+
+class FakeWindow:
+    """Stand-in for a pygetwindow window"""
+
+    def __init__(self, title, left, top, width, height):
+        self.title = title
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.isActive = False
+
+
+class FakeWindows:
+    """A desktop of `count` game windows side by side, for running lanes without a game client"""
+
+    def __init__(self, count=2, size=(1280, 1024), title=GAME_TITLE):
+        width, height = size
+        self.windows = [FakeWindow(title, index * width, 0, width, height) for index in range(count)]
+        self.activations = 0
+
+    def find(self):
+        return list(self.windows)
+
+    def activate(self, window):
+        for other in self.windows:
+            other.isActive = other is window
+        self.activations += 1
+
+
+class DesktopWindows:
+    """Every open game window, brought to the front through pygetwindow"""
+
+    def __init__(self, title=GAME_TITLE):
+        self.locator = WindowLocator(title)
+        self.activations = 0
+
+    def find(self):
+        return self.locator.find_all()
+
+    def activate(self, window):
+        window.activate()
+        self.activations += 1
+
+
+class FakeScreen:
+    """Capture and input for one fake window
+
+    Input that lands while another window is in front, or a pointer action
+    outside this window, is counted as misdirected.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.inputs = 0
+        self.misdirected = 0
+        self.commands = []
+        self.pointer = None
+
+    def _input(self, point=None):
+        self.inputs += 1
+        window = self.window
+        outside = point is not None and not (window.left <= point[0] < window.left + window.width
+                                             and window.top <= point[1] < window.top + window.height)
+        if not window.isActive or outside:
+            self.misdirected += 1
+
+    def grab(self, region_name):
+        raise KeyError(f"Fake window has no frames for region '{region_name}'")
+
+    def grab_regions(self, *region_names):
+        return {}
+
+    def move_to(self, x, y):
+        self.pointer = (x, y)
+        self._input(self.pointer)
+
+    def scroll(self, amount):
+        self._input(self.pointer)
+
+    def click(self, x, y):
+        self.pointer = (x, y)
+        self._input(self.pointer)
+
+    def type_text(self, text):
+        self._input()
+
+    def send(self, command):
+        self._input()
+        self.commands.append(command)
+
+
+class InputLane:
+    """Capture backend and invite sender for one window of a multi-client run
+
+    Grabs go straight to `backend`, since every window has its own part of
+    the screen. Mouse and keyboard are shared, so each input action holds
+    `input_lock`, brings this lane's window to the front and, for scrolling,
+    puts the pointer back where this lane last left it.
+    """
+
+    def __init__(self, backend, window, windows, input_lock, sender=None, activate_delay=0.05):
+        self.backend = backend
+        self.window = window
+        self.windows = windows
+        self.input_lock = input_lock
+        self.sender = sender
+        # Time for the client to accept input after it comes to the front
+        self.activate_delay = activate_delay
+        self.pointer = None
+        # Seconds spent waiting for other lanes to finish their input
+        self.waited = 0.0
+
+    def grab(self, region_name):
+        return self.backend.grab(region_name)
+
+    def grab_regions(self, *region_names):
+        return self.backend.grab_regions(*region_names)
+
+    def _acquire(self):
+        started = time.perf_counter()
+        self.input_lock.acquire()
+        self.waited += time.perf_counter() - started
+        try:
+            if not self.window.isActive:
+                self.windows.activate(self.window)
+                if self.activate_delay:
+                    time.sleep(self.activate_delay)
+            if not self.window.isActive:
+                raise RuntimeError("could not bring the game window to the front")
+        except Exception:
+            self.input_lock.release()
+            raise
+
+    def activate(self):
+        """Bring this lane's window to the front, e.g. before a scan starts typing"""
+        self._acquire()
+        self.input_lock.release()
+
+    def move_to(self, x, y):
+        self._acquire()
+        try:
+            self.backend.move_to(x, y)
+            self.pointer = (x, y)
+        finally:
+            self.input_lock.release()
+
+    def scroll(self, amount):
+        self._acquire()
+        try:
+            if self.pointer:
+                self.backend.move_to(*self.pointer)
+            self.backend.scroll(amount)
+        finally:
+            self.input_lock.release()
+
+    def click(self, x, y):
+        self._acquire()
+        try:
+            self.backend.click(x, y)
+            self.pointer = (x, y)
+        finally:
+            self.input_lock.release()
+
+    def type_text(self, text):
+        self._acquire()
+        try:
+            self.backend.type_text(text)
+        finally:
+            self.input_lock.release()
+
+    def send(self, command):
+        """Sender interface for this lane's InviteDispatcher"""
+        self._acquire()
+        try:
+            self.sender.send(command)
+        finally:
+            self.input_lock.release()
+
+
+class SharedInvites:
+    """Cooldown, ledger and in-flight claims shared by every lane
+
+    claim() hands each eligible name to the first lane that asks for it, so
+    two clients never invite the same player, even before either has sent.
+    """
+
+    def __init__(self, cooldown, ledger=None):
+        self.cooldown = cooldown
+        self.ledger = ledger
+        self.claims = {}     # normalized name -> lane index
+        self.duplicates = 0  # names dropped because another lane had them
+        self._lock = threading.Lock()
+
+    def claim(self, names, lane):
+        """The names out of cooldown that no other lane holds, now held by `lane`"""
+        with self._lock:
+            claimed = []
+            for name in self.cooldown.filter_eligible(names):
+                key = normalize_name(name)
+                if key in self.claims:
+                    if self.claims[key] != lane:
+                        self.duplicates += 1
+                    continue
+                self.claims[key] = lane
+                claimed.append(name)
+            return claimed
+
+    def sent(self, name):
+        with self._lock:
+            if self.ledger is not None:
+                self.ledger.record(name)
+            self.cooldown.record(name)
+
+
+class SharedRanges:
+    """One SweepScheduler feeding several lanes
+
+    A range is leased to the lane that drew it until that lane reports its
+    scan, so two lanes never search the same levels at once. A lane that
+    finds every range leased waits for one to be reported.
+    """
+
+    def __init__(self, scheduler, poll=0.25):
+        self.scheduler = scheduler
+        self.poll = poll
+        self.leased = set()
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        level_range = self.lease()
+        if level_range is None:
+            raise StopIteration
+        return level_range
+
+    def lease(self, stop=None):
+        """The next free range, now leased, or None once there are no more
+
+        `stop` is an optional threading.Event that ends the wait for a lease,
+        so a lane that is stopped does not sit here until the others finish.
+        """
+        scheduler = self.scheduler
+        with self._condition:
+            while not self._closed and not (stop is not None and stop.is_set()):
+                if scheduler.max_queries is not None and scheduler.queries >= scheduler.max_queries:
+                    break
+                level_range = scheduler.peek(exclude=self.leased)
+                if level_range is not None:
+                    scheduler.queries += 1
+                    self.leased.add((level_range[0], level_range[1]))
+                    return level_range
+                if not self.leased:
+                    break
+                self._condition.wait(self.poll)
+        return None
+
+    def release(self, level_range):
+        """Give back a range whose lane stopped or failed before reporting it"""
+        with self._condition:
+            self.leased.discard((level_range[0], level_range[1]))
+            self._condition.notify_all()
+
+    def report(self, level_range, total, new):
+        with self._condition:
+            self.leased.discard((level_range[0], level_range[1]))
+            self.scheduler.report(level_range, total, new)
+            self._condition.notify_all()
+
+    def peek(self):
+        with self._condition:
+            return self.scheduler.peek(exclude=self.leased)
+
+    def snapshot(self):
+        with self._condition:
+            return self.scheduler.snapshot()
+
+    def close(self):
+        """End iteration for every lane, including ones waiting for a lease"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+def overlapping_windows(windows):
+    """Pairs of windows whose rectangles intersect
+
+    Lanes grab their part of the screen without bringing their window to the
+    front, so a window partly covered by another would be read wrong.
+    """
+    overlaps = []
+    for index, first in enumerate(windows):
+        for second in windows[index + 1:]:
+            if (first.left < second.left + second.width and second.left < first.left + first.width
+                    and first.top < second.top + second.height and second.top < first.top + first.height):
+                overlaps.append((first, second))
+    return overlaps
+
+
+class Lane:
+    """One game window's engine, dispatcher and verifier"""
+
+    def __init__(self, index, window, engine, dispatcher, verifier=None, input_lane=None):
+        self.index = index
+        self.window = window
+        self.engine = engine
+        self.dispatcher = dispatcher
+        self.verifier = verifier
+        self.input_lane = input_lane
+        self.stats = {'status': IDLE.title(), 'current_range': '--', 'processed': 0}
+
+    def summary(self):
+        return {
+            'lane': self.index + 1,
+            'status': self.stats.get('status', IDLE.title()),
+            'current_range': self.stats.get('current_range', '--'),
+            'processed': self.stats.get('processed', 0),
+            'rate': self.dispatcher.throughput()
+        }
+
+
+class Orchestrator:
+    """Runs a RecruitmentEngine per game window over shared ranges, OCR pool and invites
+
+    `build_lane(orchestrator, index, window)` returns the Lane for a window,
+    passing `orchestrator.ranges` to its engine and the callbacks from
+    lane_callbacks(index). Lane logs and stats are merged and handed on to
+    `on_batch(logs, stats)` like a single engine's, with the per-lane
+    summaries under stats['lanes']. The orchestrator can stand in for a
+    RecruitmentEngine wherever only start, pause, resume and stop are used.
+    """
+
+    def __init__(self, windows, build_lane, scheduler, on_batch=None, on_state=None):
+        self.windows = windows
+        self.build_lane = build_lane
+        self.ranges = SharedRanges(scheduler)
+        self.on_batch = on_batch
+        self.on_state = on_state
+        # Mouse and keyboard go to whichever window is in front; one lane uses them at a time
+        self.input_lock = threading.Lock()
+
+        self.lanes = []
+        self.state = IDLE
+        # Counted before this run, e.g. restored from the last session
+        self.base_processed = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self):
+        return any(lane.engine.is_running for lane in self.lanes)
+
+    def lane_callbacks(self, index):
+        return {
+            'on_batch': lambda logs, stats: self._lane_batch(index, logs, stats),
+            'on_state': lambda state: self._lane_state(index, state)
+        }
+
+    def start(self):
+        """One lane per game window found; returns how many were started
+
+        Raises RuntimeError, starting nothing, if any two windows overlap.
+        """
+        if self.is_running:
+            return len(self.lanes)
+        windows = self.windows.find()
+        overlaps = overlapping_windows(windows)
+        if overlaps:
+            pairs = ', '.join(f"{windows.index(first) + 1} and {windows.index(second) + 1}"
+                              for first, second in overlaps)
+            raise RuntimeError(f"Game windows overlap ({pairs}); move them apart so each is fully visible")
+        self.lanes = [self.build_lane(self, index, window) for index, window in enumerate(windows)]
+        for lane in self.lanes:
+            lane.engine.start()
+        return len(self.lanes)
+
+    def pause(self):
+        for lane in self.lanes:
+            lane.engine.pause()
+
+    def resume(self):
+        for lane in self.lanes:
+            lane.engine.resume()
+
+    def stop(self, timeout=None):
+        self.ranges.close()
+        for lane in self.lanes:
+            lane.engine.stop()
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+            for lane in self.lanes:
+                lane.engine.stop(max(0.0, deadline - time.monotonic()))
+
+    def stats(self):
+        """Totals over every lane, plus each lane's summary under 'lanes'"""
+        with self._lock:
+            lanes = [lane.summary() for lane in self.lanes]
+        upcoming = self.ranges.peek()
+        return {
+            'processed': self.base_processed + sum(lane['processed'] for lane in lanes),
+            'current_range': ', '.join(lane['current_range'] for lane in lanes if lane['current_range'] != '--') or '--',
+            'next_range': f"{upcoming[0]}-{upcoming[1]}" if upcoming else '--',
+            'rate': sum(lane['rate'] for lane in lanes),
+            'lanes': lanes
+        }
+
+    def _lane_batch(self, index, logs, stats):
+        with self._lock:
+            self.lanes[index].stats = stats
+        if self.on_batch:
+            self.on_batch([(f"[Lane {index + 1}] {message}", color) for message, color in logs], self.stats())
+
+    def _lane_state(self, index, state):
+        lane = self.lanes[index]
+        if state == IDLE and lane.verifier is not None:
+            lane.verifier.stop()
+
+        states = [other.engine.state for other in self.lanes]
+        if all(other == IDLE for other in states):
+            combined = IDLE
+        elif all(other in (PAUSED, IDLE) for other in states):
+            combined = PAUSED
+        elif INVITING in states:
+            combined = INVITING
+        else:
+            combined = SCANNING
+        with self._lock:
+            if combined == self.state:
+                return
+            self.state = combined
+        if self.on_state:
+            self.on_state(combined)
+
+
+def simulate_lanes(count=2, queries=16, scan_seconds=0.2, rate_per_minute=600, width=10, seed=None,
+                   stream=True, max_pending=40, regions_path=None):
+    """Run `count` lanes on fake windows against a SimulatedPopulation, in real time
+
+    Each lane resolves its regions through RegionRegistry.for_lane, like the
+    GUI's lanes; `regions_path` is a picker file, by default one with the
+    default regions picked in the first window. Each scan clicks the search
+    box and types its query, then scrolls three pages of the names list,
+    sleeping a third of `scan_seconds` per page as OCR would. Returns
+    invites per lane, how many names more than one lane found, the median
+    delay from a range's start to its first invite, and any input that
+    reached a window while another was in front or landed outside its own
+    window, which should stay at zero.
+    """
+    from Emperor.utils.cooldown import CooldownIndex
+    from Emperor.utils.dispatcher import InviteDispatcher
+    from Emperor.utils.engine import RecruitmentEngine
+    from Emperor.utils.sweep import SweepScheduler, SimulatedPopulation
+
+    population = SimulatedPopulation(seed=seed)
+    population_lock = threading.Lock()
+    invites = SharedInvites(CooldownIndex())
+    windows = FakeWindows(count)
+    screens = {}
+
+    temp_dir = None
+    if regions_path is None:
+        temp_dir = tempfile.TemporaryDirectory()
+        regions_path = os.path.join(temp_dir.name, 'regions')
+        with open(regions_path, 'w', encoding='utf-8') as f:
+            for name, (left, top, right, bottom) in DEFAULT_REGIONS.items():
+                f.write(f"{name}\n Selected coordinates: ({left}, {top}) to ({right}, {bottom})\n\n")
+        first = windows.windows[0]
+        record_window((first.left, first.top, first.width, first.height), regions_path)
+
+    def center(box):
+        return (box[0] + box[2]) // 2, (box[1] + box[3]) // 2
+
+    def build_lane(orchestrator, index, window):
+        screen = screens[index] = FakeScreen(window)
+        lane_input = InputLane(screen, window, orchestrator.windows, orchestrator.input_lock,
+                               sender=screen, activate_delay=0)
+        registry = RegionRegistry.for_lane(regions_path)
+        registry.update_window(window.left, window.top, window.width, window.height)
+
+        def scan(level_range, checkpoint, on_names=None):
+            checkpoint()
+            lane_input.click(*center(registry['text_entry']))
+            lane_input.type_text(f"{level_range[0]}-{level_range[1]}")
+            lane_input.move_to(*center(registry['names']))
+            with population_lock:
+                population.advance(scan_seconds)
+                names = population.who(level_range[0], level_range[1])
+            page_size = -(-len(names) // 3) or 1
+            for start in range(0, len(names), page_size):
+                checkpoint()
+                lane_input.scroll(-2400)
+                time.sleep(scan_seconds / 3)
+                if on_names:
+                    on_names(names[start:start + page_size])
+            return names
+
+        def on_sent(name):
+            invites.sent(name)
+            engine.invited(name)
+
+        dispatcher = InviteDispatcher(sender=lane_input, rate_per_minute=rate_per_minute,
+                                      ceiling_per_minute=rate_per_minute, jitter=0, on_sent=on_sent,
+                                      max_pending=max_pending)
+        engine = RecruitmentEngine(scan, dispatcher, orchestrator.ranges,
+                                   filter_names=lambda names: invites.claim(names, index),
+                                   poll_interval=0.02, stream=stream, **orchestrator.lane_callbacks(index))
+        return Lane(index, window, engine, dispatcher, input_lane=lane_input)
+
+    scheduler = SweepScheduler(width, max_queries=queries, clock=lambda: population.clock)
+    orchestrator = Orchestrator(windows, build_lane, scheduler)
+    started = time.perf_counter()
+    try:
+        orchestrator.start()
+        while orchestrator.is_running:
+            time.sleep(0.05)
+    finally:
+        if temp_dir is not None:
+            temp_dir.cleanup()
+    elapsed = time.perf_counter() - started
+
+    commands = [command for screen in screens.values() for command in screen.commands]
+    first_invites = sorted(delay for lane in orchestrator.lanes for delay in lane.engine.first_invites)
+    return {
+        'lanes': count,
+        'elapsed': elapsed,
+        'invites': len(commands),
+        'invites_per_lane': [len(screens[index].commands) for index in range(count)],
+        'invites_per_minute': len(commands) * 60 / elapsed if elapsed else 0.0,
+        'first_invite': first_invites[len(first_invites) // 2] if first_invites else None,
+        'duplicate_invites': len(commands) - len(set(commands)),
+        'claims_skipped': invites.duplicates,
+        'misdirected_inputs': sum(screen.misdirected for screen in screens.values()),
+        'activations': windows.activations,
+        'input_wait': sum(lane.input_lane.waited for lane in orchestrator.lanes)
+    }
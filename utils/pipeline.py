@@ -0,0 +1,160 @@
+import math
+import queue
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+# Marks the end of the frame stream for each consumer
+_DONE = object()
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of samples"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(q / 100 * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+class StageTimer:
+    """Thread-safe wall-clock totals per pipeline stage"""
+
+    def __init__(self):
+        self._samples = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self._lock:
+            self._samples[stage].append(seconds)
+
+    @contextmanager
+    def measure(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started)
+
+    def samples(self, stage):
+        with self._lock:
+            return list(self._samples.get(stage, []))
+
+    def summary(self):
+        with self._lock:
+            return {
+                stage: {
+                    'count': len(values),
+                    'total': sum(values),
+                    'mean': sum(values) / len(values),
+                    'p50': percentile(values, 50),
+                    'p90': percentile(values, 90),
+                    'max': max(values)
+                }
+                for stage, values in self._samples.items() if values
+            }
+
+
+class CapturePipeline:
+    """Overlaps scrolling and grabbing the next page with OCR of the previous ones"""
+
+    def __init__(self, grab_page, recognize, ocr_workers=1, queue_size=2, on_page=None):
+        self.grab_page = grab_page
+        self.recognize = recognize
+        self.ocr_workers = max(1, int(ocr_workers))
+        self.queue_size = max(1, int(queue_size))
+        # Called with (index, result) strictly in page order, from an OCR thread
+        self.on_page = on_page
+        self.timer = StageTimer()
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Grab no further pages; frames already queued are still recognized"""
+        self._stop.set()
+
+    def run(self, pages):
+        """Grab up to `pages` frames and return the recognized results in page order"""
+        self.timer = StageTimer()
+        self._stop.clear()
+        frames = queue.Queue(maxsize=self.queue_size)
+        results = []
+        waiting = {}
+        errors = []
+        failed = threading.Event()
+        deliver_lock = threading.Lock()
+        started = time.perf_counter()
+
+        def produce():
+            try:
+                for index in range(pages):
+                    if self._stop.is_set() or failed.is_set():
+                        break
+                    with self.timer.measure('capture'):
+                        frame = self.grab_page(index)
+                    # Time spent here means OCR is the bottleneck
+                    with self.timer.measure('queue_wait'):
+                        frames.put((index, frame))
+            except Exception as e:
+                errors.append(e)
+                failed.set()
+            finally:
+                for _ in range(self.ocr_workers):
+                    frames.put(_DONE)
+
+        def deliver(index, result):
+            # Consumers finish out of order; hand pages on in order
+            with deliver_lock:
+                waiting[index] = result
+                while len(results) in waiting:
+                    result = waiting.pop(len(results))
+                    results.append(result)
+                    if self.on_page:
+                        self.on_page(len(results) - 1, result)
+
+        def consume():
+            while True:
+                item = frames.get()
+                if item is _DONE:
+                    return
+                if failed.is_set():
+                    continue
+                index, frame = item
+                try:
+                    with self.timer.measure('ocr'):
+                        result = self.recognize(frame)
+                    deliver(index, result)
+                except Exception as e:
+                    errors.append(e)
+                    failed.set()
+
+        threads = [threading.Thread(target=produce, name="capture-producer", daemon=True)]
+        threads += [
+            threading.Thread(target=consume, name=f"ocr-consumer-{i}", daemon=True)
+            for i in range(self.ocr_workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.elapsed = time.perf_counter() - started
+        if errors:
+            raise errors[0]
+        return results
+
+    def report(self):
+        """Per-stage timing plus the stage that limited throughput"""
+        stages = self.timer.summary()
+        busy = {
+            'capture': stages.get('capture', {}).get('total', 0.0),
+            # OCR runs on several consumers at once, so spread its total across them
+            'ocr': stages.get('ocr', {}).get('total', 0.0) / self.ocr_workers
+        }
+        return {
+            'elapsed': self.elapsed,
+            'stages': stages,
+            'bottleneck': max(busy, key=busy.get) if any(busy.values()) else None
+        }
@@ -0,0 +1,142 @@
+import numpy as np
+
+
+class Grayscale:
+    """RGB(A) to single-channel luminance"""
+
+    def __call__(self, image):
+        if image.ndim == 2:
+            return image
+        return (image[..., :3] @ np.array([0.299, 0.587, 0.114])).astype(np.uint8)
+
+
+class CropColumns:
+    """Keep only the text column: fractions of the width, or the inked span when none are given"""
+
+    def __init__(self, left=None, right=None, margin=4, contrast=40):
+        self.left = left
+        self.right = right
+        self.margin = margin
+        self.contrast = contrast
+
+    def __call__(self, image):
+        width = image.shape[1]
+        if self.left is not None or self.right is not None:
+            left = int(width * (self.left or 0.0))
+            right = int(round(width * (self.right if self.right is not None else 1.0)))
+            return image[:, left:right]
+
+        gray = image if image.ndim == 2 else image[..., :3].mean(axis=2)
+        inked = np.flatnonzero((np.abs(gray - np.median(gray)) > self.contrast).any(axis=0))
+        if not inked.size:
+            return image
+        return image[:, max(0, inked[0] - self.margin):min(width, inked[-1] + 1 + self.margin)]
+
+
+class Threshold:
+    """Binarize to 0/255; with no level given, Otsu's threshold is used"""
+
+    def __init__(self, level=None, invert=False):
+        self.level = level
+        self.invert = invert
+
+    @staticmethod
+    def otsu(gray):
+        histogram = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+        weights = np.cumsum(histogram)
+        means = np.cumsum(histogram * np.arange(256))
+        total = weights[-1]
+        background = weights[:-1]
+        foreground = total - background
+        with np.errstate(divide='ignore', invalid='ignore'):
+            between = (means[-1] * background - means[:-1] * total) ** 2 / (background * foreground)
+        return int(np.nanargmax(between))
+
+    def __call__(self, image):
+        level = self.level if self.level is not None else self.otsu(image)
+        binary = image > level
+        if self.invert:
+            binary = ~binary
+        return binary.astype(np.uint8) * 255
+
+
+class Scale:
+    """Resize by `factor` with plain numpy: pixel repeat up, block mean down"""
+
+    def __init__(self, factor):
+        self.factor = factor
+
+    def __call__(self, image):
+        if self.factor == 1:
+            return image
+        if self.factor > 1 and float(self.factor).is_integer():
+            factor = int(self.factor)
+            return image.repeat(factor, axis=0).repeat(factor, axis=1)
+        if self.factor < 1 and float(1 / self.factor).is_integer():
+            step = int(1 / self.factor)
+            height = image.shape[0] - image.shape[0] % step
+            width = image.shape[1] - image.shape[1] % step
+            blocks = image[:height, :width].reshape(height // step, step, width // step, step, *image.shape[2:])
+            return blocks.mean(axis=(1, 3)).astype(image.dtype)
+
+        # Any other factor: nearest-neighbour sampling
+        rows = (np.arange(int(image.shape[0] * self.factor)) / self.factor).astype(int)
+        columns = (np.arange(int(image.shape[1] * self.factor)) / self.factor).astype(int)
+        return image[rows][:, columns]
+
+
+class LanczosResize:
+    """The original PIL 2x LANCZOS upscale, kept as a baseline for the benchmark"""
+
+    def __init__(self, factor=2):
+        self.factor = factor
+
+    def __call__(self, image):
+        from PIL import Image
+        picture = Image.fromarray(image)
+        picture = picture.resize(
+            (int(picture.width * self.factor), int(picture.height * self.factor)),
+            Image.LANCZOS
+        )
+        return np.array(picture)
+
+
+class Profile:
+    """An ordered chain of preprocessing steps"""
+
+    def __init__(self, *steps):
+        self.steps = steps
+
+    def __call__(self, image):
+        image = np.asarray(image)
+        for step in self.steps:
+            image = step(image)
+        return image
+
+
+PROFILES = {
+    'legacy': Profile(LanczosResize(2)),
+    'gray_1x': Profile(Grayscale()),
+    'gray_2x': Profile(Grayscale(), Scale(2)),
+    'binary_1x': Profile(Grayscale(), Threshold()),
+    'binary_2x': Profile(Grayscale(), Threshold(), Scale(2)),
+    'gray_half': Profile(Grayscale(), Scale(0.5)),
+    'column_2x': Profile(Grayscale(), CropColumns(), Scale(2)),
+    'column_binary_2x': Profile(Grayscale(), CropColumns(), Threshold(), Scale(2)),
+}
+
+# Starting profile for each capture region; benchmark.py --profiles compares alternatives
+REGION_PROFILES = {
+    'who': 'gray_1x',
+    'text_entry': 'gray_1x',
+    'results': 'gray_2x',
+    'scroll': 'gray_1x',
+    'names': 'gray_2x',
+}
+
+
+def get_profile(name):
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown preprocessing profile: {name}") from None
@@ -0,0 +1,115 @@
+import io
+import os
+import queue
+import threading
+import zipfile
+from collections import deque
+import numpy as np
+
+
+# Wakes the writer thread up when the recorder is stopped
+_STOP = object()
+
+
+class FrameRecorder:
+    """Writes captured frames to disk on a background thread, dropping frames when it falls behind
+
+    mode='directory' keeps the newest `max_frames` PNGs in `directory`.
+    mode='archive' appends raw .npy frames to zip chunks of `chunk_size` frames.
+    Files are named <region>_<sequence>, so a session can be replayed in order.
+    """
+
+    def __init__(self, directory, mode='directory', max_frames=500, chunk_size=200, queue_size=32):
+        if mode not in ('directory', 'archive'):
+            raise ValueError(f"Unknown recorder mode: {mode}")
+        self.directory = directory
+        self.mode = mode
+        self.max_frames = max_frames
+        self.chunk_size = chunk_size
+
+        self.recorded = 0
+        self.dropped = 0
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._sequence = 0
+        self._written = deque()
+        self._archive = None
+        self._archive_count = 0
+        self._thread = None
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="frame-recorder", daemon=True)
+            self._thread.start()
+        return self
+
+    def record(self, region_name, frame):
+        """Queue a frame without blocking; returns False if it had to be dropped"""
+        if self._thread is None:
+            self.start()
+        try:
+            # Copy: the frame may be a view into a buffer the grabber reuses
+            self._queue.put_nowait((self._sequence, region_name, np.array(frame)))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self._sequence += 1
+        return True
+
+    def stop(self, timeout=5.0):
+        """Flush whatever is queued and close the current archive chunk"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            try:
+                self._write(*item)
+                self.recorded += 1
+            except OSError as e:
+                self.dropped += 1
+                print(f"Frame recorder error: {str(e)}")
+        self._close_archive()
+
+    def _write(self, sequence, region_name, frame):
+        name = f"{region_name}_{sequence:06d}"
+        if self.mode == 'archive':
+            self._write_archive(name, frame)
+            return
+
+        from PIL import Image
+        path = os.path.join(self.directory, f"{name}.png")
+        Image.fromarray(frame).save(path)
+        self._written.append(path)
+
+        # Rotate: only the newest max_frames stay on disk
+        while self.max_frames and len(self._written) > self.max_frames:
+            old = self._written.popleft()
+            if os.path.exists(old):
+                os.remove(old)
+
+    def _write_archive(self, name, frame):
+        if self._archive is None or self._archive_count >= self.chunk_size:
+            self._close_archive()
+            chunk = len([f for f in os.listdir(self.directory) if f.endswith('.zip')])
+            path = os.path.join(self.directory, f"frames_{chunk:04d}.zip")
+            # Stored, not deflated, so writing stays cheap
+            self._archive = zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED)
+            self._archive_count = 0
+
+        buffer = io.BytesIO()
+        np.save(buffer, frame)
+        self._archive.writestr(f"{name}.npy", buffer.getvalue())
+        self._archive_count += 1
+
+    def _close_archive(self):
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
@@ -0,0 +1,227 @@
+import re
+import threading
+from pathlib import Path
+
+
+GAME_TITLE = "Star Wars™: The Old Republic™"
+
+# Region list written by the coordinate picker
+REGIONS_FILE = Path(__file__).resolve().parent.parent / 'jsons' / 's'
+
+# Used when the regions file is missing or empty
+DEFAULT_REGIONS = {
+    'who': (23, 51, 255, 105),
+    'text_entry': (62, 126, 436, 164),
+    'results': (776, 122, 1222, 172),
+    'scroll': (1187, 239, 1216, 1023),
+    'names': (58, 240, 400, 1016),
+    'invites': (1723, 640, 1866, 669)
+}
+
+# Names used by the picker that differ from the ones used in code
+ALIASES = {'textentry': 'text_entry'}
+
+COORDINATES = re.compile(r'Selected coordinates:\s*\((\d+),\s*(\d+)\)\s*to\s*\((\d+),\s*(\d+)\)')
+
+
+def parse_regions(text):
+    """Read 'name' lines each followed by 'Selected coordinates: (x1, y1) to (x2, y2)'"""
+    regions = {}
+    name = None
+    for line in text.splitlines():
+        line = line.strip()
+        match = COORDINATES.search(line)
+        if match and name:
+            left, top, right, bottom = (int(value) for value in match.groups())
+            regions[ALIASES.get(name, name)] = (min(left, right), min(top, bottom),
+                                                max(left, right), max(top, bottom))
+            name = None
+        elif line and not match:
+            name = line.lower().replace(' ', '_')
+    return regions
+
+
+def record_window(rect, path=REGIONS_FILE):
+    """Add the game window's (left, top, width, height) to the picker's file as its 'window' entry
+
+    Does nothing if the file already has one, e.g. written by another registry.
+    """
+    if 'window' in parse_regions(Path(path).read_text(encoding='utf-8')):
+        return
+    left, top, width, height = rect
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(f"\nwindow\n Selected coordinates: ({left}, {top}) to ({left + width}, {top + height})\n")
+
+
+class RegionRegistry:
+    """Regions stored relative to the game window and resolved against where it is now
+
+    A registry loaded from a file that names the window the regions were
+    picked in resolves them against any window, so each client of a
+    multi-client run gets its own. Without that entry the first window seen
+    is taken to be the one they were picked in, and is recorded in the file
+    (`path`) for later runs.
+    """
+
+    def __init__(self, regions, reference_rect=(0, 0, None, None), path=None):
+        origin_x, origin_y, width, height = reference_rect
+        self.reference_size = (width, height) if width and height else None
+        self.relative = {
+            name: (left - origin_x, top - origin_y, right - origin_x, bottom - origin_y)
+            for name, (left, top, right, bottom) in regions.items()
+        }
+        self.window_rect = (origin_x, origin_y, width, height)
+        # Without a reference size the regions are the picker's screen coordinates,
+        # taken while the window was where it is first seen
+        self.anchored = self.reference_size is not None
+        self.path = path
+        self.regions = {}
+        self._lock = threading.Lock()
+        self._resolve()
+
+    @classmethod
+    def from_file(cls, path=REGIONS_FILE, **kwargs):
+        """Regions from the picker's file; a 'window' entry there is the game window they were picked in"""
+        try:
+            regions = parse_regions(Path(path).read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            regions = {}
+        window = regions.pop('window', None)
+        if window and 'reference_rect' not in kwargs:
+            left, top, right, bottom = window
+            kwargs['reference_rect'] = (left, top, right - left, bottom - top)
+        if regions:
+            kwargs.setdefault('path', path)
+        return cls(regions or DEFAULT_REGIONS, **kwargs)
+
+    @classmethod
+    def for_lane(cls, path=REGIONS_FILE):
+        """Registry for one window of a multi-client run
+
+        Regions are picked in one client; the others can only be given their
+        own copies if the file says where that client was, so a file without
+        a 'window' entry is refused rather than guessed at.
+        """
+        registry = cls.from_file(path)
+        if not registry.anchored:
+            raise RuntimeError("The regions file does not record the game window they were picked in; "
+                               "run once with a single client to record it, then start multi-client again")
+        return registry
+
+    def _resolve(self):
+        left, top, width, height = self.window_rect
+        scale_x = scale_y = 1.0
+        # Only scale when we know what size the regions were picked at
+        if self.reference_size and width and height:
+            scale_x = width / self.reference_size[0]
+            scale_y = height / self.reference_size[1]
+        self.regions = {
+            name: (left + round(x1 * scale_x), top + round(y1 * scale_y),
+                   left + round(x2 * scale_x), top + round(y2 * scale_y))
+            for name, (x1, y1, x2, y2) in self.relative.items()
+        }
+
+    def update_window(self, left, top, width, height):
+        """Follow a window move or resize; returns True if the absolute regions changed
+
+        The first rect seen by a registry without a reference becomes it, so
+        regions stay where they were picked and follow the window from there.
+        """
+        with self._lock:
+            rect = (left, top, width, height)
+            if rect == self.window_rect:
+                return False
+            if not self.anchored:
+                self.anchored = True
+                shift_x = left - self.window_rect[0]
+                shift_y = top - self.window_rect[1]
+                self.relative = {
+                    name: (x1 - shift_x, y1 - shift_y, x2 - shift_x, y2 - shift_y)
+                    for name, (x1, y1, x2, y2) in self.relative.items()
+                }
+                self.reference_size = (width, height)
+                if self.path:
+                    try:
+                        record_window(rect, self.path)
+                    except OSError as e:
+                        print(f"Error recording the game window in {self.path}: {str(e)}")
+            self.window_rect = rect
+            previous = self.regions
+            self._resolve()
+            return self.regions != previous
+
+    def __getitem__(self, name):
+        return self.regions[name]
+
+
+class WindowLocator:
+    """Caches the game window and only enumerates all windows when the handle goes stale
+
+    A locator built with `window` is pinned to that one client, as each lane
+    of a multi-client run is, and never falls back to another game window.
+    """
+
+    def __init__(self, title=GAME_TITLE, window=None):
+        self.title = title
+        self.enumerations = 0
+        self.pinned = window
+        self._window = window
+
+    def _find(self):
+        if self.pinned is not None:
+            return self.pinned if self._is_valid(self.pinned) else None
+        import pygetwindow as gw
+        self.enumerations += 1
+        for window in gw.getWindowsWithTitle(self.title):
+            if self.title in window.title:
+                return window
+        return None
+
+    def _is_valid(self, window):
+        try:
+            return self.title in window.title
+        except Exception:
+            return False
+
+    def get(self):
+        """The game window, or None if it is not open"""
+        if self._window is None or not self._is_valid(self._window):
+            self._window = self._find()
+        return self._window
+
+    def is_focused(self):
+        """Whether the game is the foreground window, usually a single handle query"""
+        window = self._window
+        if window is not None:
+            try:
+                # Our handle being in the foreground proves it is still valid
+                if window.isActive:
+                    return True
+            except Exception:
+                pass
+        window = self.get()
+        return bool(window and window.isActive)
+
+    def rect(self):
+        window = self.get()
+        if window is None:
+            return None
+        return window.left, window.top, window.width, window.height
+
+    def activate(self):
+        """Bring the game window to the front; False if it is not open"""
+        window = self.get()
+        if window is None:
+            return False
+        if not window.isActive:
+            window.activate()
+        return True
+
+    def invalidate(self):
+        self._window = None
+
+    def find_all(self):
+        """Every open game window, e.g. to give each its own lane"""
+        import pygetwindow as gw
+        self.enumerations += 1
+        return [window for window in gw.getWindowsWithTitle(self.title) if self.title in window.title]
@@ -0,0 +1,151 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def to_gray(image):
+    image = np.asarray(image)
+    if image.ndim == 3:
+        return image[..., :3].mean(axis=2)
+    return image.astype(np.float32)
+
+
+def ink_mask(gray, contrast=40):
+    """Pixels that stand out from the list background (the median grey level)"""
+    return np.abs(gray - np.median(gray)) > contrast
+
+
+def find_row_bounds(image, min_height=6, max_gap=3, contrast=40):
+    """Split a list image into (top, bottom) text rows using its horizontal projection profile"""
+    ink = ink_mask(to_gray(image), contrast)
+    active = ink.sum(axis=1) > max(1, ink.shape[1] // 100)
+
+    # Start/end of every run of rows that contain ink
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], active.astype(np.int8), [0]))))
+    runs = list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+
+    # Join runs split by small gaps, e.g. accents sitting above a capital letter
+    merged = []
+    for top, bottom in runs:
+        if merged and top - merged[-1][1] <= max_gap:
+            merged[-1] = (merged[-1][0], bottom)
+        else:
+            merged.append((top, bottom))
+    return [(top, bottom) for top, bottom in merged if bottom - top >= min_height]
+
+
+def row_grid(bounds, height):
+    """Extend detected rows into the fixed grid the list is drawn on"""
+    if len(bounds) < 2:
+        return list(bounds)
+
+    starts = np.array([top for top, _ in bounds])
+    pitch = int(np.median(np.diff(starts)))
+    row_height = int(np.median([bottom - top for top, bottom in bounds]))
+    # Pad each row so descenders and accents are not clipped
+    pad = max(1, (pitch - row_height) // 2)
+
+    first = int(starts[0]) % pitch
+    return [
+        (max(0, top - pad), min(height, top + row_height + pad))
+        for top in range(first, height - row_height + 1, pitch)
+    ]
+
+
+def row_key(row, contrast=40):
+    """Exact digest of a row's ink, cropped to its bounding box
+
+    Binarizing first makes the key ignore background noise and the crop makes
+    it ignore where the text sits, but any changed glyph pixel changes it, so
+    two names a letter apart never share a key.
+    """
+    ink = ink_mask(to_gray(row), contrast)
+    ys = np.flatnonzero(ink.any(axis=1))
+    xs = np.flatnonzero(ink.any(axis=0))
+    if not len(ys):
+        return None
+    ink = ink[ys[0]:ys[-1] + 1, xs[0]:xs[-1] + 1]
+    digest = hashlib.blake2b(np.packbits(ink).tobytes(), digest_size=16)
+    digest.update(np.array(ink.shape, dtype=np.int32).tobytes())
+    return digest.digest()
+
+
+class RowRecognizer:
+    """Reads a names capture row by row, sending only unseen rows to recognition"""
+
+    def __init__(self, ocr, allowlist, contrast=40, max_entries=4096):
+        self.ocr = ocr
+        self.allowlist = allowlist
+        self.contrast = contrast
+        self.bounds = None
+        # Least recently read rows are dropped first once it is full
+        self.max_entries = max_entries
+        self.cache = OrderedDict()
+        self.recognized = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+
+    def calibrate(self, image):
+        """Locate the list rows; done once because the list is a fixed grid"""
+        image = np.asarray(image)
+        self.bounds = row_grid(find_row_bounds(image, contrast=self.contrast), image.shape[0])
+        return self.bounds
+
+    def lookup(self, key):
+        text = self.cache.get(key)
+        if text is not None:
+            self.cache.move_to_end(key)
+        return text
+
+    def store(self, key, text):
+        self.cache[key] = text
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+
+    def read(self, image):
+        """Return the text of every non-empty row, top to bottom"""
+        image = np.asarray(image)
+        with self._lock:
+            if self.bounds is None:
+                self.calibrate(image)
+            bounds = self.bounds
+
+        gray = to_gray(image)
+        texts = [None] * len(bounds)
+        keys = [None] * len(bounds)
+        pending = []
+        with self._lock:
+            for i, (top, bottom) in enumerate(bounds):
+                keys[i] = row_key(gray[top:bottom], self.contrast)
+                # Blank rows below the end of the list never need OCR
+                if keys[i] is None:
+                    texts[i] = ''
+                    continue
+                texts[i] = self.lookup(keys[i])
+                if texts[i] is None:
+                    pending.append(i)
+                else:
+                    self.reused += 1
+
+        if pending:
+            width = image.shape[1]
+            boxes = [[0, width, bounds[i][0], bounds[i][1]] for i in pending]
+            results = self.ocr.recognize(
+                image,
+                boxes,
+                allowlist=self.allowlist,
+                batch_size=len(boxes),
+                contrast_ths=0.1
+            )
+            # Map each result back to its row through the top edge of its box
+            by_top = {int(box[0][1]): text for box, text, _ in results}
+            with self._lock:
+                for i in pending:
+                    texts[i] = by_top.get(bounds[i][0], '').strip()
+                    self.store(keys[i], texts[i])
+                self.recognized += len(pending)
+
+        return [text for text in texts if text]
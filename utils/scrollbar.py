@@ -0,0 +1,35 @@
+import numpy as np
+
+
+def thumb_span(frame, contrast=25, min_length=8, edge=3):
+    """(top, bottom) of the scrollbar thumb as fractions of the track, or None if there is none
+
+    The track colour is read from the ends of the track, not from the bulk
+    of it, since a thumb for under 40 results covers more than half. When
+    the two ends differ the thumb is sitting on one of them, and the darker
+    end is the track: the game draws the thumb lighter.
+    """
+    frame = np.asarray(frame)
+    gray = frame[..., :3].mean(axis=2) if frame.ndim == 3 else frame.astype(np.float32)
+    # The thumb spans most of the track width, so a row mean is enough
+    profile = gray.mean(axis=1)
+    top, bottom = profile[:edge].mean(), profile[-edge:].mean()
+    track = min(top, bottom) if abs(top - bottom) > contrast else (top + bottom) / 2
+    thumb = np.abs(profile - track) > contrast
+
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], thumb.astype(np.int8), [0]))))
+    if not edges.size:
+        return None
+    starts, ends = edges[::2], edges[1::2]
+    longest = int(np.argmax(ends - starts))
+    if ends[longest] - starts[longest] < min_length:
+        return None
+    return starts[longest] / len(profile), ends[longest] / len(profile)
+
+
+def thumb_at_bottom(frame, tolerance=0.02):
+    """True when the thumb touches the end of the track; None when no thumb is visible"""
+    span = thumb_span(frame)
+    if span is None:
+        return None
+    return span[1] >= 1.0 - tolerance
@@ -0,0 +1,180 @@
+import json
+import os
+import threading
+import time
+
+
+def empty_state():
+    return {
+        'range': None,      # [low, high] being worked on
+        'scanned': False,   # whether the scan of that range finished
+        'pages': [],        # OCR'd /who pages of that range, while it is still being scanned
+        'queue': [],        # its names still waiting to be invited, once the scan is done
+        'retries': {},      # name -> [attempt, due as wall-clock time]
+        'sweep': None       # SweepScheduler snapshot plus the time it was taken
+    }
+
+
+class SessionCheckpoint:
+    """Recruitment progress as a snapshot plus an append-only journal
+
+    Every step appends one small JSON line to <path>.journal: a range started,
+    a page read, a scan finished, an invite sent, a retry scheduled or taken.
+    compact() folds the journal into the snapshot. Loading replays the journal
+    over the snapshot and drops a torn last line, the same way InviteLedger
+    does for invites.
+    """
+
+    def __init__(self, path, compact_every=200, sync=False):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.compact_every = compact_every
+        # fsync every entry; off by default since a lost step is only redone
+        self.sync = sync
+
+        self.state = empty_state()
+        self.pending = 0
+
+        self._journal = None
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.state.update(json.load(f))
+        except (FileNotFoundError, ValueError):
+            pass
+
+        valid_bytes = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    valid_bytes += len(line)
+                    self._apply(entry)
+                    self.pending += 1
+            if valid_bytes != os.path.getsize(self.journal_path):
+                with open(self.journal_path, 'r+b') as f:
+                    f.truncate(valid_bytes)
+
+    def _apply(self, entry):
+        state = self.state
+        op = entry['op']
+        if op == 'range':
+            state['range'] = entry['range']
+            state['scanned'] = False
+            state['pages'] = []
+            state['queue'] = []
+        elif op == 'page':
+            state['pages'].append(entry['names'])
+        elif op == 'scanned':
+            state['scanned'] = True
+            state['pages'] = []
+            state['queue'] = list(entry['names'])
+        elif op == 'sent':
+            if entry['name'] in state['queue']:
+                state['queue'].remove(entry['name'])
+            state['retries'].pop(entry['name'], None)
+        elif op == 'retry':
+            state['retries'][entry['name']] = [entry['attempt'], entry['due']]
+        elif op == 'sweep':
+            state['sweep'] = entry['sweep']
+        elif op == 'done':
+            retries = state['retries']
+            self.state = empty_state()
+            self.state['retries'] = retries
+
+    def _append(self, entry):
+        with self._lock:
+            self._apply(entry)
+            if self._journal is None:
+                self._journal = open(self.journal_path, 'a', encoding='utf-8')
+            self._journal.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._journal.flush()
+            if self.sync:
+                os.fsync(self._journal.fileno())
+            self.pending += 1
+            if self.compact_every and self.pending >= self.compact_every:
+                self._compact()
+
+    def begin_range(self, level_range):
+        self._append({'op': 'range', 'range': list(level_range)})
+
+    def page(self, names):
+        self._append({'op': 'page', 'names': list(names)})
+
+    def scanned(self, names):
+        """The range's scan is done; `names` are what is left to invite"""
+        self._append({'op': 'scanned', 'names': list(names)})
+
+    def sent(self, name):
+        self._append({'op': 'sent', 'name': name})
+
+    def retry(self, name, attempt, delay):
+        self._append({'op': 'retry', 'name': name, 'attempt': attempt, 'due': time.time() + delay})
+
+    def sweep(self, snapshot):
+        self._append({'op': 'sweep', 'sweep': {'saved_at': time.time(), 'state': snapshot}})
+
+    def done(self):
+        """The sweep finished; only retries carry over to the next session"""
+        self._append({'op': 'done'})
+
+    @property
+    def has_session(self):
+        state = self.state
+        return bool(state['range'] or state['queue'] or state['retries'])
+
+    def resume_range(self):
+        """(level range, scanned, OCR'd pages, names to invite) left by the last session, or None"""
+        state = self.state
+        if not state['range']:
+            return None
+        pages = [list(page) for page in state['pages']]
+        return tuple(state['range']), state['scanned'], pages, list(state['queue'])
+
+    def restore_retries(self, retry_queue, now=None):
+        """Put saved retries back on `retry_queue`, keeping how long each still had to wait"""
+        now = time.time() if now is None else now
+        for name, (attempt, due) in self.state['retries'].items():
+            retry_queue.restore(name, attempt, due - now)
+        return len(self.state['retries'])
+
+    def sweep_snapshot(self):
+        """Saved scheduler state and how many seconds ago it was taken"""
+        saved = self.state['sweep']
+        if not saved:
+            return None, 0.0
+        return saved['state'], max(0.0, time.time() - saved['saved_at'])
+
+    def compact(self):
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        open(self.journal_path, 'w').close()
+        self.pending = 0
+
+    def close(self):
+        with self._lock:
+            if self.pending:
+                self._compact()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
@@ -0,0 +1,94 @@
+import os
+import time
+import numpy as np
+
+
+def frame_signature(frame, step=4):
+    """Downsampled grayscale copy of a frame, cheap enough to take every few ms"""
+    small = np.asarray(frame)[::step, ::step]
+    if small.ndim == 3:
+        small = small[..., :3].mean(axis=2)
+    return small.astype(np.int16)
+
+
+def frames_match(a, b, tolerance=2.0):
+    """True when two signatures differ by at most `tolerance` grey levels on average"""
+    if a is None or b is None or a.shape != b.shape:
+        return False
+    return float(np.abs(a - b).mean()) <= tolerance
+
+
+class SettleDetector:
+    """Polls a region until two consecutive frames match, instead of sleeping blindly"""
+
+    def __init__(self, grab, interval=0.03, timeout=1.5, change_timeout=0.5, step=4, tolerance=2.0):
+        self.grab = grab
+        self.interval = interval
+        self.timeout = timeout
+        self.change_timeout = change_timeout
+        self.step = step
+        self.tolerance = tolerance
+        self.last_wait = None
+
+    def signature(self, frame):
+        return frame_signature(frame, self.step)
+
+    def wait(self, reference=None):
+        """Return (frame, settled) once the region is stable or the timeout passes.
+
+        When a `reference` signature from before the scroll is given, a stable
+        frame identical to it is only accepted after `change_timeout`, so we do
+        not capture the old page before the list starts redrawing.
+        """
+        started = time.perf_counter()
+        frame = self.grab()
+        previous = self.signature(frame)
+
+        while True:
+            elapsed = time.perf_counter() - started
+            if elapsed >= self.timeout:
+                self.last_wait = elapsed
+                return frame, False
+
+            if self.interval:
+                time.sleep(self.interval)
+            frame = self.grab()
+            current = self.signature(frame)
+
+            if frames_match(previous, current, self.tolerance):
+                unchanged = frames_match(reference, current, self.tolerance)
+                if not unchanged or time.perf_counter() - started >= self.change_timeout:
+                    self.last_wait = time.perf_counter() - started
+                    return frame, True
+            previous = current
+
+
+class FrameSequence:
+    """Replays frames saved as .npy or image files, for running the detector offline"""
+
+    def __init__(self, directory):
+        names = sorted(
+            name for name in os.listdir(directory)
+            if name.lower().endswith(('.npy', '.png', '.bmp', '.jpg'))
+        )
+        if not names:
+            raise ValueError(f"No frames found in {directory}")
+        self.frames = [self._load(os.path.join(directory, name)) for name in names]
+        self.position = 0
+
+    @staticmethod
+    def _load(path):
+        if path.lower().endswith('.npy'):
+            return np.load(path)
+        from PIL import Image
+        with Image.open(path) as image:
+            return np.array(image.convert('RGB'))
+
+    def grab(self):
+        """Next frame in the sequence; the last one repeats once it runs out"""
+        frame = self.frames[min(self.position, len(self.frames) - 1)]
+        self.position += 1
+        return frame
+
+    def __call__(self):
+        return self.grab()
@@ -0,0 +1,258 @@
+import random
+import time
+from collections import namedtuple
+
+
+MIN_LEVEL = 1
+MAX_LEVEL = 80
+# /who never lists more than this many players
+RESULT_CAP = 100
+
+LevelRange = namedtuple('LevelRange', 'low high')
+
+
+class RangeStats:
+    """What the last scans of one level range turned up"""
+
+    def __init__(self):
+        self.scans = 0
+        self.last_scan = None
+        self.last_total = 0
+        self.last_new = 0
+        self.yield_rate = None      # smoothed new names per scan
+
+    def update(self, total, new, now, smoothing):
+        self.scans += 1
+        self.last_scan = now
+        self.last_total = total
+        self.last_new = new
+        if self.yield_rate is None:
+            self.yield_rate = float(new)
+        else:
+            self.yield_rate += smoothing * (new - self.yield_rate)
+
+
+class SweepScheduler:
+    """Chooses the next /who level range from the yield of earlier scans
+
+    Levels 1-80 start out split into ranges of `width`. A range that hits the
+    result cap is split in two so nobody is hidden past the 100th row; two
+    neighbouring ranges that together stay well under the cap are merged
+    into one query. Unscanned ranges go first, in level order. After that the
+    range with the best expected yield wins, where a range's yield recovers
+    linearly over `recovery` seconds as new players log in. A range that
+    gave nothing new is skipped for `exhausted_for` seconds.
+
+    Iterating yields LevelRange tuples; report() feeds each scan's result
+    back. Iteration ends once every range is resting, or after `max_queries`.
+    """
+
+    def __init__(self, width=10, cap=RESULT_CAP, recovery=900.0, exhausted_for=600.0,
+                 smoothing=0.5, max_queries=None, clock=time.monotonic):
+        self.cap = cap
+        self.recovery = recovery
+        self.exhausted_for = exhausted_for
+        self.smoothing = smoothing
+        self.max_queries = max_queries
+        self.clock = clock
+
+        width = max(1, int(width))
+        self.bounds = [(low, min(low + width - 1, MAX_LEVEL)) for low in range(MIN_LEVEL, MAX_LEVEL + 1, width)]
+        self.stats = {bounds: RangeStats() for bounds in self.bounds}
+        self.queries = 0
+
+    def _range(self, bounds):
+        return LevelRange(*bounds)
+
+    def expected_yield(self, bounds, now=None):
+        """New names we expect from scanning `bounds` now; None while it is resting"""
+        stats = self.stats[bounds]
+        if stats.last_scan is None:
+            return float('inf')
+        now = self.clock() if now is None else now
+        age = now - stats.last_scan
+        if stats.last_new == 0 and age < self.exhausted_for:
+            return None
+        rate = stats.yield_rate
+        # A full list means more players than we could see, so keep it attractive
+        if stats.last_total >= self.cap:
+            rate = max(rate, 1.0)
+        if not self.recovery:
+            return rate
+        return rate * min(1.0, age / self.recovery)
+
+    def peek(self, now=None, exclude=()):
+        """The range next() would return, without counting it as a query; `exclude` bounds are skipped"""
+        now = self.clock() if now is None else now
+        best = None
+        best_yield = None
+        for bounds in self.bounds:
+            if bounds in exclude:
+                continue
+            expected = self.expected_yield(bounds, now)
+            # Strictly greater keeps ties in level order
+            if expected is not None and (best_yield is None or expected > best_yield):
+                best, best_yield = bounds, expected
+        return self._range(best) if best else None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.max_queries is not None and self.queries >= self.max_queries:
+            raise StopIteration
+        level_range = self.peek()
+        if level_range is None:
+            raise StopIteration
+        self.queries += 1
+        return level_range
+
+    def report(self, level_range, total, new, now=None):
+        """Record that scanning `level_range` listed `total` players, `new` of them not seen before"""
+        now = self.clock() if now is None else now
+        bounds = (level_range[0], level_range[1])
+        if bounds not in self.stats:
+            return
+        self.stats[bounds].update(total, new, now, self.smoothing)
+
+        if total >= self.cap:
+            self._split(bounds)
+        else:
+            self._merge(bounds)
+
+    def _split(self, bounds):
+        low, high = bounds
+        if low == high:
+            return
+        middle = (low + high) // 2
+        halves = [(low, middle), (middle + 1, high)]
+        index = self.bounds.index(bounds)
+        self.bounds[index:index + 1] = halves
+        del self.stats[bounds]
+        for half in halves:
+            # Neither half has been seen on its own; scan them before anything older
+            self.stats[half] = RangeStats()
+
+    def _merge(self, bounds):
+        """Join `bounds` with its next neighbour when both came back well under the cap"""
+        index = self.bounds.index(bounds)
+        if index + 1 >= len(self.bounds):
+            return
+        neighbour = self.bounds[index + 1]
+        stats, other = self.stats[bounds], self.stats[neighbour]
+        if other.last_scan is None or stats.last_total + other.last_total > self.cap // 2:
+            return
+        merged = (bounds[0], neighbour[1])
+        combined = RangeStats()
+        combined.scans = stats.scans + other.scans
+        combined.last_scan = min(stats.last_scan, other.last_scan)
+        combined.last_total = stats.last_total + other.last_total
+        combined.last_new = stats.last_new + other.last_new
+        combined.yield_rate = stats.yield_rate + other.yield_rate
+        self.bounds[index:index + 2] = [merged]
+        del self.stats[bounds], self.stats[neighbour]
+        self.stats[merged] = combined
+
+    def snapshot(self, now=None):
+        """JSON-friendly state, with scan times stored as ages in seconds"""
+        now = self.clock() if now is None else now
+        ranges = []
+        for low, high in self.bounds:
+            stats = self.stats[(low, high)]
+            age = None if stats.last_scan is None else now - stats.last_scan
+            ranges.append([low, high, stats.scans, age, stats.last_total, stats.last_new, stats.yield_rate])
+        return {'queries': self.queries, 'ranges': ranges}
+
+    def restore(self, snapshot, elapsed=0.0, now=None):
+        """Load a snapshot() taken `elapsed` seconds ago"""
+        now = self.clock() if now is None else now
+        self.queries = snapshot.get('queries', 0)
+        self.bounds = []
+        self.stats = {}
+        for low, high, scans, age, last_total, last_new, yield_rate in snapshot['ranges']:
+            stats = RangeStats()
+            stats.scans = scans
+            stats.last_scan = None if age is None else now - age - elapsed
+            stats.last_total = last_total
+            stats.last_new = last_new
+            stats.yield_rate = yield_rate
+            self.bounds.append((low, high))
+            self.stats[(low, high)] = stats
+
+    def exhausted(self, now=None):
+        """Ranges currently resting because their last scan found nothing new"""
+        now = self.clock() if now is None else now
+        return [self._range(bounds) for bounds in self.bounds if self.expected_yield(bounds, now) is None]
+
+
+class SimulatedPopulation:
+    """Players logging in and out at random levels, queried like /who
+
+    Most of the population sits at the level cap, the way live servers do.
+    """
+
+    def __init__(self, size=600, max_level_share=0.45, churn_per_minute=20, seed=None):
+        self.random = random.Random(seed)
+        self.churn_per_minute = churn_per_minute
+        self.max_level_share = max_level_share
+        self.clock = 0.0
+        self.next_id = 0
+        self.online = {}
+        for _ in range(size):
+            self._login()
+
+    def _level(self):
+        if self.random.random() < self.max_level_share:
+            return MAX_LEVEL
+        return self.random.randint(MIN_LEVEL, MAX_LEVEL - 1)
+
+    def _login(self):
+        self.online[f"PLAYER{self.next_id:05d}"] = self._level()
+        self.next_id += 1
+
+    def advance(self, seconds):
+        """Let `seconds` pass, replacing players at the churn rate"""
+        self.clock += seconds
+        for _ in range(int(self.churn_per_minute * seconds / 60 + self.random.random())):
+            if self.online:
+                del self.online[self.random.choice(list(self.online))]
+            self._login()
+
+    def who(self, low, high, cap=RESULT_CAP):
+        """Names listed for a level range, cut off at the result cap like the game"""
+        names = sorted(name for name, level in self.online.items() if low <= level <= high)
+        return names[:cap]
+
+
+def simulate(ranges, population, queries=100, seconds_per_query=20.0):
+    """Drive a range source against a SimulatedPopulation and count new names per query
+
+    `ranges` is a SweepScheduler or any iterable of level ranges; a scheduler's
+    clock should read population.clock.
+    """
+    seen = set()
+    history = []
+    iterator = iter(ranges)
+    report = getattr(ranges, 'report', None)
+    for _ in range(queries):
+        try:
+            level_range = next(iterator)
+        except StopIteration:
+            break
+        names = population.who(level_range[0], level_range[1])
+        new = [name for name in names if name not in seen]
+        seen.update(new)
+        if report:
+            report(level_range, len(names), len(new))
+        history.append((level_range, len(names), len(new)))
+        population.advance(seconds_per_query)
+
+    minutes = len(history) * seconds_per_query / 60
+    return {
+        'queries': len(history),
+        'unique_names': len(seen),
+        'names_per_query': len(seen) / len(history) if history else 0.0,
+        'names_per_minute': len(seen) / minutes if minutes else 0.0,
+        'capped_queries': sum(1 for _, total, _ in history if total >= RESULT_CAP),
+        'history': history
+    }
@@ -0,0 +1,253 @@
+import heapq
+import queue
+import threading
+import time
+import numpy as np
+from Emperor.utils.names import match_key
+from Emperor.utils.rows import ink_mask, to_gray
+
+
+SUCCESS = 'success'
+ALREADY_IN_GUILD = 'already_in_guild'
+NOT_FOUND = 'not_found'
+UNKNOWN = 'unknown'
+
+# Lower-case fragments of the system messages shown in the invites region
+OUTCOME_PATTERNS = [
+    (ALREADY_IN_GUILD, ('already in a guild', 'already a member', 'already in guild')),
+    (NOT_FOUND, ('not found', 'no player', 'cannot find', 'does not exist', 'not online')),
+    (SUCCESS, ('invited', 'invitation sent', 'has been invited')),
+]
+
+# Failures worth trying again later; someone already in a guild will not change.
+# An unreadable reply says nothing about the invite, so UNKNOWN is only reported.
+RETRYABLE = (NOT_FOUND,)
+
+
+def classify_text(text):
+    text = text.lower()
+    for outcome, fragments in OUTCOME_PATTERNS:
+        if any(fragment in text for fragment in fragments):
+            return outcome
+    return UNKNOWN
+
+
+def message_words(frame, contrast=40, gap=4):
+    """Binarized crop of each word of a one-line message, left to right
+
+    Words are runs of ink columns split at blank gaps of `gap` pixels or
+    more; each crop is trimmed to its own ink, so a name with descenders
+    does not change how the words around it look.
+    """
+    ink = ink_mask(to_gray(frame), contrast)
+    columns = ink.any(axis=0)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], columns.astype(np.int8), [0]))))
+    spans = []
+    for left, right in zip(edges[::2].tolist(), edges[1::2].tolist()):
+        if spans and left - spans[-1][1] < gap:
+            spans[-1] = (spans[-1][0], right)
+        else:
+            spans.append((left, right))
+    words = []
+    for left, right in spans:
+        word = ink[:, left:right]
+        rows = np.flatnonzero(word.any(axis=1))
+        words.append(word[rows[0]:rows[-1] + 1])
+    return words
+
+
+def words_match(a, b, tolerance=0.1):
+    """Whether two word crops are the same text: sizes within a pixel, few pixels different"""
+    if abs(a.shape[0] - b.shape[0]) > 1 or abs(a.shape[1] - b.shape[1]) > 1:
+        return False
+    height, width = min(a.shape[0], b.shape[0]), min(a.shape[1], b.shape[1])
+    return float((a[:height, :width] != b[:height, :width]).mean()) <= tolerance
+
+
+def changed(a, b, level=40, pixels=3):
+    """Whether two frames of the invites region show different text"""
+    if a is None or b is None or a.shape != b.shape:
+        return True
+    return np.count_nonzero(np.abs(to_gray(a) - to_gray(b)) > level) >= pixels
+
+
+class RetryQueue:
+    """Names to invite again, each after an exponentially growing delay"""
+
+    def __init__(self, max_attempts=3, base_delay=30.0, factor=2.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.factor = factor
+        self.attempts = {}
+        self.given_up = []
+        # Called with (name, attempt, delay) for every scheduled retry, e.g. to checkpoint it
+        self.on_schedule = None
+        self._heap = []
+        self._lock = threading.Lock()
+
+    def add(self, name, now=None):
+        """Schedule another attempt; returns False once the name has used them all"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            attempt = self.attempts.get(name, 0) + 1
+            if attempt > self.max_attempts:
+                self.given_up.append(name)
+                return False
+            self.attempts[name] = attempt
+            delay = self.base_delay * self.factor ** (attempt - 1)
+            heapq.heappush(self._heap, (now + delay, name))
+        if self.on_schedule:
+            self.on_schedule(name, attempt, delay)
+        return True
+
+    def restore(self, name, attempt, delay, now=None):
+        """Put back a retry saved by an earlier session, due in `delay` seconds"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.attempts[name] = max(attempt, self.attempts.get(name, 0))
+            heapq.heappush(self._heap, (now + max(0.0, delay), name))
+
+    def due(self, now=None):
+        """Names whose backoff has elapsed, removed from the queue"""
+        now = time.monotonic() if now is None else now
+        ready = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                ready.append(heapq.heappop(self._heap)[1])
+        return ready
+
+    def snapshot(self):
+        with self._lock:
+            return [name for _, name in sorted(self._heap)]
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class InviteVerifier:
+    """Checks the invites region after each invite and sorts out failures, off the dispatch thread
+
+    Invites are checked in the order they went out, so the reply to one is
+    the first message that differs from the reply to the one before (or
+    from the region as it was at start). The region is polled until it
+    shows something new and stops changing; no reply within `timeout` is
+    UNKNOWN. Replies differ only by the player's name, so a message read
+    once is remembered by its other words, with the name left out, and
+    later replies of that kind are sorted without OCR.
+    """
+
+    def __init__(self, grab, ocr, timeout=2.0, interval=0.03, retry_queue=None, on_result=None,
+                 tolerance=0.1):
+        self.grab = grab
+        self.ocr = ocr
+        # How long to wait for the system message after the command is sent
+        self.timeout = timeout
+        self.interval = interval
+        self.retry_queue = retry_queue if retry_queue is not None else RetryQueue()
+        self.on_result = on_result
+        # Fraction of a word's pixels that may differ from a remembered one
+        self.tolerance = tolerance
+
+        self.counts = {SUCCESS: 0, ALREADY_IN_GUILD: 0, NOT_FOUND: 0, UNKNOWN: 0}
+        self.ocr_reads = 0
+        self.templates = []
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._stop = threading.Event()
+        # The last settled frame of the region, which the next reply has to differ from
+        self._last = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            try:
+                self._last = np.array(self.grab())
+            except Exception:
+                self._last = None
+            self._thread = threading.Thread(target=self._run, name="invite-verifier", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, name, sent_at=None):
+        """Queue a dispatched invite for checking; never blocks the caller"""
+        self._queue.put((name, time.monotonic() if sent_at is None else sent_at))
+
+    def pending(self):
+        """Invites submitted but not checked yet"""
+        return self._queue.unfinished_tasks
+
+    def join(self):
+        """Wait until every submitted invite has been checked"""
+        self._queue.join()
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def classify(self, frame, name=None):
+        words = message_words(frame)
+        for name_index, template, outcome in self.templates:
+            if len(words) != len(template) + 1:
+                continue
+            rest = words[:name_index] + words[name_index + 1:]
+            if all(words_match(word, known, self.tolerance) for word, known in zip(rest, template)):
+                return outcome
+
+        self.ocr_reads += 1
+        text = ' '.join(self.ocr.readtext(frame, detail=0, paragraph=True))
+        outcome = classify_text(text)
+        # Only remember messages we understood, and only if we can tell which word is the name
+        if outcome != UNKNOWN and name:
+            read = text.split()
+            key = match_key(name)
+            matches = [index for index, word in enumerate(read) if key and key in match_key(word)]
+            if len(read) == len(words) and len(matches) == 1:
+                name_index = matches[0]
+                self.templates.append((name_index, words[:name_index] + words[name_index + 1:], outcome))
+        return outcome
+
+    def wait_for_reply(self, before, deadline):
+        """The first settled frame that differs from `before`, or None if nothing new arrives in time"""
+        previous = None
+        while not self._stop.is_set():
+            frame = np.array(self.grab())
+            if changed(before, frame):
+                if previous is not None and not changed(previous, frame):
+                    return frame
+                previous = frame
+            else:
+                previous = None
+            if time.monotonic() >= deadline:
+                return None
+            self._stop.wait(self.interval)
+        return None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                name, sent_at = self._queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            try:
+                try:
+                    frame = self.wait_for_reply(self._last, sent_at + self.timeout)
+                    if self._stop.is_set():
+                        break
+                    if frame is None:
+                        outcome = UNKNOWN
+                    else:
+                        self._last = frame
+                        outcome = self.classify(frame, name)
+                except Exception as e:
+                    print(f"Invite verifier error: {str(e)}")
+                    outcome = UNKNOWN
+
+                self.counts[outcome] += 1
+                retried = outcome in RETRYABLE and self.retry_queue.add(name)
+                if self.on_result:
+                    self.on_result(name, outcome, retried)
+            finally:
+                self._queue.task_done()